@@ -1,252 +1,494 @@
-import winreg
+import argparse
+import json
+import ntpath
 import os
+import time
 from pathlib import Path
 
-def get_installed_programs_from_registry():
+from catalog import GameCatalog
+from classifier import DEFAULT_CLASSIFIER, GameClassifier
+from exe_finder import DEFAULT_LIMIT as DEFAULT_EXE_LIMIT, DEFAULT_MAX_DEPTH, find_executables
+from merge import DEFAULT_PRECEDENCE, SOURCE_HKCU, SOURCE_HKLM, SOURCE_HKLM_WOW64, SOURCE_STEAM, merge_programs
+from path_index import ProgramPathIndex, location_filter
+from pe_rank import PEHeaderCache, rank_executables
+from profiling import ProfiledSource, Profiler
+from records import Program, ProgramTable, TableView
+from registry_source import HKCU, HKLM, SnapshotSource, capture_snapshot, default_source, save_snapshot
+from scan_cache import ScanCache, default_cache_dir
+from steam_library import build_app_index
+from streaming import ordered_imap
+
+# Registry paths where installed programs are listed
+UNINSTALL_PATHS = [
+    (HKLM, r"SOFTWARE\Microsoft\Windows\CurrentVersion\Uninstall"),
+    (HKLM, r"SOFTWARE\WOW6432Node\Microsoft\Windows\CurrentVersion\Uninstall"),
+    (HKCU, r"SOFTWARE\Microsoft\Windows\CurrentVersion\Uninstall")
+]
+# Program.source for each of UNINSTALL_PATHS, used for merge precedence
+UNINSTALL_SOURCES = [SOURCE_HKLM, SOURCE_HKLM_WOW64, SOURCE_HKCU]
+STEAM_PATH = r"SOFTWARE\WOW6432Node\Valve\Steam"
+STEAM_APPS_PATH = STEAM_PATH + r"\Apps"
+
+PROGRAM_VALUES = ("DisplayName", "InstallLocation", "UninstallString", "Publisher")
+
+# Executables collected per game before ranking, as a multiple of the limit
+RANK_POOL_FACTOR = 4
+
+# Subkeys handed to one worker at a time
+BATCH_SIZE = 128
+DEFAULT_WORKERS = 8
+
+def _list_subkeys(source, hive, path):
+    try:
+        return source.enum_subkeys(hive, path)
+    except (OSError, PermissionError):
+        return []
+
+def _list_subkeys_with_timestamps(source, hive, path, timestamps=True):
+    if not timestamps:
+        return [(name, None) for name in _list_subkeys(source, hive, path)]
+    try:
+        return source.enum_subkeys_with_timestamps(hive, path)
+    except (OSError, PermissionError):
+        return []
+
+def _read_program_batch(source, hive, path, subkey_names):
     """
-    Get installed programs from Windows registry.
+    Read a batch of Uninstall subkeys. Returns one entry per name, which is
+    None when the key could not be read or is not a program.
     """
     programs = []
-    
-    # Registry paths where installed programs are listed
-    registry_paths = [
-        (winreg.HKEY_LOCAL_MACHINE, r"SOFTWARE\Microsoft\Windows\CurrentVersion\Uninstall"),
-        (winreg.HKEY_LOCAL_MACHINE, r"SOFTWARE\WOW6432Node\Microsoft\Windows\CurrentVersion\Uninstall"),
-        (winreg.HKEY_CURRENT_USER, r"SOFTWARE\Microsoft\Windows\CurrentVersion\Uninstall")
-    ]
-    
-    for hkey, subkey_path in registry_paths:
+    for subkey_name in subkey_names:
         try:
-            with winreg.OpenKey(hkey, subkey_path) as key:
-                for i in range(winreg.QueryInfoKey(key)[0]):  # Number of subkeys
-                    try:
-                        subkey_name = winreg.EnumKey(key, i)
-                        with winreg.OpenKey(key, subkey_name) as subkey:
-                            program_info = extract_program_info(subkey)
-                            if program_info:
-                                programs.append(program_info)
-                    except (OSError, PermissionError):
-                        continue
+            values = source.query_values(hive, path + "\\" + subkey_name, PROGRAM_VALUES)
         except (OSError, PermissionError):
+            programs.append(None)
             continue
-    
+        programs.append(extract_program_info(values))
     return programs
 
-def extract_program_info(registry_key):
+def iter_installed_programs(source=None, workers=DEFAULT_WORKERS, cache=None):
+    """
+    Yield installed programs from the registry as they are read.
+
+    The Uninstall hives are enumerated concurrently and their subkeys are read
+    in batches on a thread pool. Programs come out in hive order, then subkey
+    order, so the output is the same as a serial walk.
+
+    With a ScanCache only subkeys that are new or whose last-write timestamp
+    changed are reopened. The cache is updated but not saved, and deleted
+    subkeys are only dropped from it once the generator is exhausted.
     """
-    Extract program information from a registry key.
+    source = source or default_source()
+    seen_keys = set()
+
+    # Timestamps cost an extra key open per subkey, so only fetch them for the cache
+    hive_listings = ordered_imap(
+        lambda key: _list_subkeys_with_timestamps(source, *key, timestamps=cache is not None),
+        UNINSTALL_PATHS, workers=len(UNINSTALL_PATHS))
+
+    def plan_batches():
+        # Runs in the consuming thread, so the cache is never touched by workers
+        for (hive, path), source_label, entries in zip(UNINSTALL_PATHS, UNINSTALL_SOURCES, hive_listings):
+            for start in range(0, len(entries), BATCH_SIZE):
+                batch = []
+                for name, timestamp in entries[start:start + BATCH_SIZE]:
+                    cache_key = f"{hive}\\{path}\\{name}"
+                    hit, program_info = False, None
+                    if cache is not None:
+                        seen_keys.add(cache_key)
+                        hit, cached = cache.lookup(cache_key, timestamp)
+                        program_info = Program.from_dict(cached) if cached else None
+                    batch.append((name, cache_key, timestamp, hit, program_info))
+                yield hive, path, source_label, batch
+
+    def read_batch(planned):
+        hive, path, source_label, batch = planned
+        misses = [entry[0] for entry in batch if not entry[3]]
+        read = iter(_read_program_batch(source, hive, path, misses))
+        return source_label, batch, [entry[4] if entry[3] else next(read) for entry in batch]
+
+    for source_label, batch, programs in ordered_imap(read_batch, plan_batches(), workers):
+        for (name, cache_key, timestamp, hit, _), program_info in zip(batch, programs):
+            if cache is not None and not hit:
+                cache.store(cache_key, timestamp, program_info.to_dict() if program_info else None)
+            if program_info:
+                program_info.source = source_label
+                program_info.source_key = cache_key
+                yield program_info
+
+    if cache is not None:
+        cache.retain(seen_keys)
+
+def get_installed_programs_from_registry(source=None, workers=DEFAULT_WORKERS, cache=None):
     """
-    try:
-        # Get display name
-        display_name, _ = winreg.QueryValueEx(registry_key, "DisplayName")
-        
-        # Get install location
-        install_location = None
-        try:
-            install_location, _ = winreg.QueryValueEx(registry_key, "InstallLocation")
-        except FileNotFoundError:
-            try:
-                # Try alternative location fields
-                install_location, _ = winreg.QueryValueEx(registry_key, "UninstallString")
-                if install_location:
-                    # Extract directory from uninstall string
-                    install_location = os.path.dirname(install_location.strip('"'))
-            except FileNotFoundError:
-                pass
-        
-        # Get publisher
-        publisher = None
-        try:
-            publisher, _ = winreg.QueryValueEx(registry_key, "Publisher")
-        except FileNotFoundError:
-            pass
-        
-        return {
-            'name': display_name,
-            'install_location': install_location,
-            'publisher': publisher
-        }
-    
-    except FileNotFoundError:
-        # Skip entries without display name
+    Get installed programs from the registry. See iter_installed_programs.
+    """
+    return list(iter_installed_programs(source, workers, cache))
+
+def extract_program_info(values):
+    """
+    Extract program information from the values of an Uninstall registry key.
+    """
+    # Skip entries without display name
+    display_name = values.get("DisplayName")
+    if display_name is None:
         return None
 
-def get_steam_games():
+    # Get install location
+    install_location = None
+    if "InstallLocation" in values:
+        install_location = values["InstallLocation"]
+    else:
+        # Try alternative location fields
+        install_location = values.get("UninstallString")
+        if install_location:
+            # Extract directory from uninstall string; registry values are Windows paths on every platform
+            install_location = ntpath.dirname(install_location.strip('"'))
+
+    return Program(display_name, install_location, values.get("Publisher"))
+
+def steam_source_key(app_id):
     """
-    Get Steam games from registry.
+    Identity of a Steam app, the same whether it was found in the registry
+    or only through its library manifest.
     """
-    steam_games = []
-    
+    return f"steam:{app_id}"
+
+def iter_steam_games(source=None, steam_root=None, library_cache=None):
+    """
+    Yield Steam games from registry.
+
+    Install locations come from the Steam library manifests, so games in
+    secondary libraries get their own directory instead of the Steam root.
+    Installed apps that have manifests but no registry entry are yielded
+    after the registry ones. steam_root overrides the registry InstallPath
+    and library_cache is passed on to build_app_index.
+    """
+    source = source or default_source()
+
     try:
-        with winreg.OpenKey(winreg.HKEY_LOCAL_MACHINE, r"SOFTWARE\WOW6432Node\Valve\Steam") as steam_key:
-            try:
-                install_path, _ = winreg.QueryValueEx(steam_key, "InstallPath")
-                
-                # Look for Steam apps in registry
-                try:
-                    with winreg.OpenKey(winreg.HKEY_LOCAL_MACHINE, r"SOFTWARE\WOW6432Node\Valve\Steam\Apps") as apps_key:
-                        for i in range(winreg.QueryInfoKey(apps_key)[0]):
-                            try:
-                                app_id = winreg.EnumKey(apps_key, i)
-                                with winreg.OpenKey(apps_key, app_id) as app_key:
-                                    try:
-                                        name, _ = winreg.QueryValueEx(app_key, "Name")
-                                        installed, _ = winreg.QueryValueEx(app_key, "Installed")
-                                        
-                                        if installed == 1:
-                                            steam_games.append({
-                                                'name': name,
-                                                'install_location': install_path,
-                                                'publisher': 'Steam',
-                                                'app_id': app_id
-                                            })
-                                    except FileNotFoundError:
-                                        continue
-                            except (OSError, PermissionError):
-                                continue
-                except FileNotFoundError:
-                    pass
-            except FileNotFoundError:
-                pass
-    except FileNotFoundError:
-        pass
-    
-    return steam_games
+        install_path = source.query_values(HKLM, STEAM_PATH, ("InstallPath",)).get("InstallPath")
+    except (OSError, PermissionError):
+        install_path = None
+    steam_root = steam_root or install_path
+    if steam_root is None:
+        return
+
+    app_index = build_app_index(steam_root, library_cache)
 
-def is_likely_game(program):
+    # Look for Steam apps in registry
+    seen = set()
+    for app_id in _list_subkeys(source, HKLM, STEAM_APPS_PATH):
+        try:
+            values = source.query_values(HKLM, STEAM_APPS_PATH + "\\" + app_id, ("Name", "Installed"))
+        except (OSError, PermissionError):
+            continue
+        if "Name" not in values or "Installed" not in values:
+            continue
+
+        if values["Installed"] == 1:
+            seen.add(app_id)
+            app = app_index.get(app_id)
+            yield Program(values["Name"], app['install_dir'] if app else steam_root, 'Steam', app_id,
+                          source=SOURCE_STEAM, source_key=steam_source_key(app_id))
+
+    # Installed according to the manifests but not marked installed in the registry
+    for app_id in sorted(set(app_index) - seen, key=lambda app_id: (len(app_id), app_id)):
+        app = app_index[app_id]
+        yield Program(app['name'], app['install_dir'], 'Steam', app_id,
+                      source=SOURCE_STEAM, source_key=steam_source_key(app_id))
+
+def get_steam_games(source=None, steam_root=None, library_cache=None):
+    """
+    Get Steam games from registry and the Steam library manifests.
+    """
+    return list(iter_steam_games(source, steam_root, library_cache))
+
+def is_likely_game(program, classifier=None):
     """
     Determine if a program is likely a game based on various criteria.
+    See GameClassifier for the rules.
     """
-    if not program['name']:
+    return (classifier or DEFAULT_CLASSIFIER).is_game(program)
+
+def is_on_d_drive(program):
+    """
+    Check if the program is installed on D: drive.
+    """
+    if not program['install_location']:
         return False
-    
-    name_lower = program['name'].lower()
-    publisher_lower = (program['publisher'] or '').lower()
-    
-    # Game publishers and platforms
-    game_publishers = [
-        'steam', 'valve', 'epic games', 'electronic arts', 'ea', 'ubisoft',
-        'activision', 'blizzard', 'bethesda', 'cd projekt', 'rockstar',
-        'square enix', 'capcom', 'konami', 'sega', 'nintendo', 'sony',
-        'microsoft studios', 'xbox game studios', 'riot games', 'epic',
-        'gog', 'origin', 'battle.net'
-    ]
-    
-    # Game-related keywords
-    game_keywords = [
-        'game', 'games', 'simulator', 'racing', 'adventure', 'rpg',
-        'strategy', 'action', 'shooter', 'warfare', 'battle', 'combat',
-        'quest', 'fantasy', 'online', 'multiplayer', 'edition'
-    ]
-    
-    # Non-game keywords (to exclude)
-    non_game_keywords = [
-        'microsoft', 'adobe', 'driver', 'update', 'runtime', 'framework',
-        'redistributable', 'tool', 'utility', 'browser', 'antivirus',
-        'office', 'visual studio', 'windows'
-    ]
-    
-    # Check publisher
-    for publisher in game_publishers:
-        if publisher in publisher_lower:
-            return True
-    
-    # Check for non-game keywords first
-    for keyword in non_game_keywords:
-        if keyword in name_lower:
-            return False
-    
-    # Check for game keywords
-    for keyword in game_keywords:
-        if keyword in name_lower:
-            return True
-    
-    return False
+    return str(Path(program['install_location'])).upper().startswith('D:')
 
 def filter_games_on_d_drive(programs):
     """
     Filter programs that are installed on D: drive.
+    A ProgramTable or TableView is filtered into a view instead of a list.
     """
-    d_drive_games = []
-    
-    for program in programs:
-        if program['install_location']:
-            install_path = Path(program['install_location'])
-            # Check if the program is installed on D: drive
-            if str(install_path).upper().startswith('D:'):
-                d_drive_games.append(program)
-    
-    return d_drive_games
+    if isinstance(programs, (ProgramTable, TableView)):
+        return programs.filter(is_on_d_drive)
+    return [program for program in programs if is_on_d_drive(program)]
 
-def find_game_executables(install_location):
+def find_game_executables(install_location, limit=DEFAULT_EXE_LIMIT, max_depth=DEFAULT_MAX_DEPTH,
+                          game_name=None, rank=True, pe_cache=None, stats=None):
     """
     Find game executables in the installation directory.
+    Shallow directories are searched first, down to max_depth levels.
+
+    With rank=True a larger pool of candidates is collected and ordered by
+    rank_executables (PE header, size, depth, name), best first.
+    stats, if given, receives the directory walk and stat counts.
     """
-    if not install_location or not os.path.exists(install_location):
-        return []
-    
-    executables = []
-    install_path = Path(install_location)
-    
+    if not rank:
+        return find_executables(install_location, limit, max_depth, stats)
+    candidates = find_executables(install_location, limit * RANK_POOL_FACTOR, max_depth, stats)
+    return rank_executables(candidates, install_location, game_name, pe_cache, stats)[:limit]
+
+def iter_programs(source=None, workers=DEFAULT_WORKERS, cache=None, stats=None, steam_root=None, profiler=None):
+    """
+    Yield registry programs followed by Steam games.
+    The Steam library index is cached next to the scan cache, if there is one.
+    """
+    for program in iter_installed_programs(source, workers, cache):
+        _count(stats, 'programs')
+        yield program
+    library_cache = os.path.join(os.path.dirname(os.path.abspath(cache.path)), "steam_index.json") if cache else False
+    steam_games = iter_steam_games(source, steam_root, library_cache)
+    if profiler is not None:
+        steam_games = profiler.iterate('steam', steam_games)
+    for program in steam_games:
+        _count(stats, 'programs')
+        _count(stats, 'steam_games')
+        yield program
+
+def iter_games(source=None, classifier=None, location_filter=is_on_d_drive, find_exes=True,
+               workers=DEFAULT_WORKERS, cache=None, max_depth=DEFAULT_MAX_DEPTH, stats=None, steam_root=None,
+               merge=False, precedence=DEFAULT_PRECEDENCE, pe_cache=None, on_program=None, profiler=None):
+    """
+    Lazily run the whole scan: extract -> merge -> classify -> location filter -> exe discovery.
+
+    Each game is yielded as soon as it has passed every stage, as a Program
+    with its executables filled in (None when find_exes is False).
+    Executable searches for upcoming games run on a bounded thread pool.
+    Stop iterating at any point to abandon the rest of the scan.
+
+    With merge=True duplicates across hives and Steam are collapsed first
+    (see merge_programs) so the later stages run once per install. That
+    needs the whole program list, so it buffers the registry read and the
+    first game only comes out once every program was read. It is off by
+    default to keep the scan streaming.
+    stats, if given, is a dict that receives running counts per stage.
+    on_program(program, is_game), if given, is called for every program
+    after classification, before the location filter.
+    profiler, if given, is a Profiler that collects counters and stage
+    timings; profiler.finish() is called when the scan is exhausted.
+    """
+    classifier = classifier or DEFAULT_CLASSIFIER
+    source = source or default_source()
+    is_game_fn = classifier.is_game
+    filter_fn = location_filter
+    do_merge = merge_programs
+    if profiler is not None:
+        source = ProfiledSource(source, profiler)
+        is_game_fn = profiler.timed('classify', is_game_fn)
+        if filter_fn is not None:
+            filter_fn = profiler.timed('location_filter', filter_fn)
+        do_merge = profiler.timed('merge', do_merge)
+
+    def stage_games(programs):
+        for program in programs:
+            is_game = is_game_fn(program)
+            if on_program is not None:
+                on_program(program, is_game)
+            if not is_game:
+                continue
+            _count(stats, 'likely_games')
+            if filter_fn is not None and not filter_fn(program):
+                continue
+            _count(stats, 'games')
+            yield program
+
+    programs = iter_programs(source, workers, cache, stats, steam_root, profiler)
+    if merge:
+        # Read everything first so the merge timer only covers the grouping
+        programs = do_merge(list(programs), precedence)
+        if stats is not None:
+            stats['duplicates'] = stats.get('programs', 0) - len(programs)
+    games = stage_games(programs)
+    if not find_exes:
+        yield from games
+        if profiler is not None:
+            profiler.finish()
+        return
+
+    def with_executables(game):
+        game.executables = find_game_executables(
+            game.install_location, max_depth=max_depth, game_name=game.name, pe_cache=pe_cache)
+        return game
+
+    def with_executables_profiled(game):
+        counters = {}
+        start = time.perf_counter()
+        game.executables = find_game_executables(
+            game.install_location, max_depth=max_depth, game_name=game.name, pe_cache=pe_cache, stats=counters)
+        profiler.game(game.name, time.perf_counter() - start, counters)
+        return game
+
+    yield from ordered_imap(with_executables if profiler is None else with_executables_profiled, games, workers)
+    if profiler is not None:
+        profiler.finish()
+
+def _count(stats, key):
+    if stats is not None:
+        stats[key] = stats.get(key, 0) + 1
+
+def build_classifier(args):
+    """
+    Build the classifier from the --allow/--deny/--overrides options.
+    """
+    if not (args.allow or args.deny or args.overrides):
+        return DEFAULT_CLASSIFIER
+    overrides = None
+    if args.overrides:
+        with open(args.overrides, "r", encoding="utf-8") as f:
+            overrides = json.load(f)
+    return GameClassifier(allow=args.allow, deny=args.deny, overrides=overrides)
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Find installed games using the Windows Registry.")
+    parser.add_argument("--snapshot", help="read the registry from a JSON/pickle snapshot instead of winreg")
+    parser.add_argument("--save-snapshot", metavar="PATH", help="write the scanned registry keys to a snapshot file")
+    parser.add_argument("--workers", type=int, default=DEFAULT_WORKERS, help="registry reader threads")
+    parser.add_argument("--steam-root", help="Steam install directory (default: InstallPath from the registry)")
+    parser.add_argument("--merge", action="store_true",
+                        help="merge duplicate programs across registry hives and Steam (reads the whole registry before the first result)")
+    parser.add_argument("--source-precedence", type=lambda value: tuple(value.split(",")), default=DEFAULT_PRECEDENCE,
+                        metavar="SOURCES", help=f"comma separated merge priority (default: {','.join(DEFAULT_PRECEDENCE)})")
+    parser.add_argument("--under", action="append", metavar="PATH",
+                        help="only report games installed under PATH (drive, folder or UNC share); repeatable, default D:")
+    parser.add_argument("--max-depth", type=int, default=DEFAULT_MAX_DEPTH, help="how deep to search install directories for executables")
+    parser.add_argument("--cache-file", help="scan cache location (default: per-user cache directory)")
+    parser.add_argument("--allow", action="append", default=[], metavar="TERM", help="always treat names containing TERM as games")
+    parser.add_argument("--deny", action="append", default=[], metavar="TERM", help="never treat names containing TERM as games")
+    parser.add_argument("--overrides", metavar="JSON", help='file with {"program name": true/false} classification overrides')
+    cache_group = parser.add_mutually_exclusive_group()
+    cache_group.add_argument("--no-cache", action="store_true", help="do not read or write the scan cache")
+    cache_group.add_argument("--rebuild-cache", action="store_true", help="ignore the scan cache and rebuild it from scratch")
+    parser.add_argument("--catalog", metavar="PATH", help="SQLite game catalog location (default: per-user cache directory)")
+    parser.add_argument("--no-catalog", action="store_true", help="do not write scan results to the catalog")
+    parser.add_argument("--profile", nargs="?", const="scan_profile.json", metavar="JSON",
+                        help="print a per-stage profile after the scan and write it as JSON (default: scan_profile.json)")
+
+    commands = parser.add_subparsers(dest="command", metavar="{query,watch}", help="without a command a scan is run")
+    query = commands.add_parser("query", help="answer from the game catalog without rescanning")
+    query.add_argument("text", nargs="+", help="words to match against program names and publishers")
+    query.add_argument("--games-only", action="store_true", help="only programs classified as games")
+    query.add_argument("--limit", type=int, default=50)
+    query.add_argument("--json", action="store_true", help="print results as JSON")
+    query.add_argument("--catalog", metavar="PATH", default=argparse.SUPPRESS, help="SQLite game catalog location")
+    watch = commands.add_parser("watch", help="keep running and print game add/remove/change events as JSON lines")
+    watch.add_argument("--interval", type=float, default=5.0, help="seconds between polls")
+    watch.add_argument("--iterations", type=int, help="stop after this many polls")
+    return parser.parse_args(argv)
+
+def run_query(args):
+    """
+    Print catalog entries matching the query words.
+    """
+    with GameCatalog(args.catalog) as catalog:
+        if not catalog.count():
+            print("The game catalog is empty, run a scan first.")
+            return
+        results = catalog.search(" ".join(args.text), games_only=args.games_only, limit=args.limit)
+
+    if args.json:
+        print(json.dumps(results, indent=2))
+        return
+    if not results:
+        print("No matches in the game catalog.")
+        return
+    for i, program in enumerate(results, 1):
+        print(f"{i:2d}. {program['name']}")
+        if program['publisher']:
+            print(f"    Publisher: {program['publisher']}")
+        print(f"    Install Location: {program['install_location']}")
+        for exe in program['executables'][:3]:
+            print(f"      - {exe}")
+
+def run_watch(args, source, under):
+    """
+    Poll for changes and print add/remove/change events until interrupted.
+    """
+    # Imported here because watch imports this module
+    from watch import Watcher
+
+    cache_file = args.cache_file or os.path.join(default_cache_dir(), "scan_cache.json")
+    cache_dir = os.path.dirname(os.path.abspath(cache_file))
+    pe_cache = None if args.no_cache else PEHeaderCache(os.path.join(cache_dir, "pe_headers.json"))
+    library_cache = False if args.no_cache else os.path.join(cache_dir, "steam_index.json")
+    watcher = Watcher(source, classifier=build_classifier(args), location_filter=location_filter(under),
+                      steam_root=args.steam_root, precedence=args.source_precedence, max_depth=args.max_depth,
+                      pe_cache=pe_cache, library_cache=library_cache)
     try:
-        # Look for .exe files in the main directory and subdirectories (limited depth)
-        for exe_file in install_path.rglob("*.exe"):
-            if exe_file.is_file():
-                # Skip obvious non-game executables
-                exe_name = exe_file.name.lower()
-                skip_files = ['unins', 'setup', 'install', 'update', 'redist', 'crash']
-                
-                if not any(skip in exe_name for skip in skip_files):
-                    executables.append(str(exe_file))
-                    
-                    # Don't go too deep - limit to reasonable number of executables
-                    if len(executables) >= 5:
-                        break
-    except (PermissionError, OSError):
+        watcher.run(args.interval, iterations=args.iterations)
+    except KeyboardInterrupt:
         pass
-    
-    return executables
+    finally:
+        if pe_cache is not None:
+            pe_cache.save()
 
-def main():
+def main(argv=None):
     """
-    Main function to find and display games on D: drive using registry.
+    Main function to find and display games under the --under folders (D: by default) using registry.
     """
-    print("Game Detector - Finding games on D: drive using Windows Registry\n")
-    print("=" * 70)
-    
-    print("Scanning Windows Registry for installed programs...")
-    
-    # Get all installed programs
-    all_programs = get_installed_programs_from_registry()
-    
-    # Get Steam games separately
-    steam_games = get_steam_games()
-    print(f"Found {len(steam_games)} Steam games in registry.\n{steam_games}")
-    all_programs.extend(steam_games)
-    
-    print(f"Found {len(all_programs)} total installed programs.")
-    
-    # Filter for likely games
-    likely_games = [program for program in all_programs if is_likely_game(program)]
-    print(f"Identified {len(likely_games)} potential games.")
-    
-    # Filter for games on D: drive
-    d_drive_games = filter_games_on_d_drive(likely_games)
-    
-    if not d_drive_games:
-        print("\nNo games found on D: drive.")
+    args = parse_args(argv)
+    if args.command == "query":
+        run_query(args)
+        return
+
+    source = SnapshotSource.load(args.snapshot) if args.snapshot else default_source()
+
+    if args.save_snapshot:
+        roots = UNINSTALL_PATHS + [(HKLM, STEAM_PATH), (HKLM, STEAM_APPS_PATH)]
+        save_snapshot(capture_snapshot(source, roots), args.save_snapshot)
+        print(f"Registry snapshot written to {args.save_snapshot}")
+
+    under = args.under or ["D:"]
+    if args.command == "watch":
+        run_watch(args, source, under)
         return
+
+    locations = ", ".join(under)
+    print(f"Game Detector - Finding games on {locations} using Windows Registry\n")
+    print("=" * 70)
     
-    print(f"\nFound {len(d_drive_games)} games on D: drive:\n")
+    print("Scanning Windows Registry for installed programs...\n")
     
-    for i, game in enumerate(d_drive_games, 1):
+    cache = None if args.no_cache else ScanCache(args.cache_file, rebuild=args.rebuild_cache)
+    pe_cache = None
+    if cache is not None:
+        pe_cache = PEHeaderCache(os.path.join(os.path.dirname(os.path.abspath(cache.path)), "pe_headers.json"))
+    catalog = None if args.no_catalog else GameCatalog(args.catalog)
+    profiler = Profiler() if args.profile else None
+    stats = {}
+    games = iter_games(source, classifier=build_classifier(args), workers=args.workers,
+                       cache=cache, max_depth=args.max_depth, stats=stats, steam_root=args.steam_root,
+                       merge=args.merge, precedence=args.source_precedence,
+                       location_filter=location_filter(under), pe_cache=pe_cache,
+                       on_program=catalog.record_program if catalog else None, profiler=profiler)
+    found = ProgramPathIndex()
+
+    # Print each game as soon as the pipeline produces it
+    for i, game in enumerate(games, 1):
+        found.add(game)
+        if catalog is not None:
+            catalog.record_executables(game)
         print(f"{i:2d}. {game['name']}")
         if game['publisher']:
             print(f"    Publisher: {game['publisher']}")
         print(f"    Install Location: {game['install_location']}")
         
-        # Try to find game executables
-        executables = find_game_executables(game['install_location'])
+        executables = game['executables']
         if executables:
             print(f"    Executables found:")
             for exe in executables[:3]:  # Show up to 3 executables
@@ -255,9 +497,43 @@ def main():
                 print(f"      ... and {len(executables) - 3} more")
         
         print()
+
+    if cache is not None:
+        cache.save()
+        pe_cache.save()
+        cache_stats = cache.stats()
+        print(f"Scan cache: {cache_stats['hits']} hits, {cache_stats['misses']} misses, {cache_stats['removed']} removed.")
+    if catalog is not None:
+        catalog.finish_scan()
+        catalog.close()
+        print(f"Catalog: {catalog.inserted_or_updated} rows written, {catalog.unchanged} unchanged, {catalog.removed} removed.")
+
+    print(f"Found {stats.get('steam_games', 0)} Steam games in registry.")
+    if args.merge:
+        print(f"Found {stats.get('programs', 0)} total installed programs ({stats.get('duplicates', 0)} duplicates merged).")
+    else:
+        print(f"Found {stats.get('programs', 0)} total installed programs.")
+    print(f"Identified {stats.get('likely_games', 0)} potential games.")
+    if profiler is not None:
+        print()
+        print("\n".join(profiler.summary()))
+        profiler.save(args.profile)
+        print(f"Profile written to {args.profile}")
+
+    games_found = stats.get('games', 0)
+    if not games_found:
+        print(f"\nNo games found on {locations}.")
+        return
+
+    # Several --under folders are answered from the one scan
+    if len(under) > 1:
+        for prefix in under:
+            print(f"  Under {prefix:<30} {len(found.under(prefix)):>5} games")
+    for volume, volume_games in found.volumes().items():
+        print(f"  Volume {volume:<29} {len(volume_games):>5} games")
     
     print("=" * 70)
-    print(f"Registry scan complete! Found {len(d_drive_games)} games on D: drive.")
+    print(f"Registry scan complete! Found {games_found} games on {locations}.")
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    main()
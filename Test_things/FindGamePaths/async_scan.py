@@ -0,0 +1,232 @@
+"""
+asyncio front end for the scanner, for GUIs and other event loop hosts.
+
+    async for game in async_scan.iter_games(location_timeout=10):
+        ...
+
+    report = await async_scan.scan_async(location_timeout=10)
+
+The registry read runs on a worker thread and hands each game over as
+soon as it passes the filters. Its install location is then searched on
+its own thread, at most concurrency at a time, and games are yielded as
+their search finishes, so one slow drive does not hold back the others.
+A search that passes its deadline is abandoned and the game is reported
+with the executables found so far.
+
+Blocking filesystem calls cannot be interrupted: a thread stuck on a dead
+network share stays stuck until the OS gives up, but the scan no longer
+waits for it. The threads are daemon threads, so they do not keep the
+process alive. An abandoned thread gives its place among the concurrency
+running searches to the next game, but it counts against max_threads
+until it actually exits, so games behind a dead share cannot pile up
+stuck threads. Between files a search checks its abandon flag, so it
+ends as soon as the filesystem answers again.
+"""
+import asyncio
+import threading
+
+import FindGamesInstalled as scanner
+from exe_finder import DEFAULT_LIMIT, DEFAULT_MAX_DEPTH, iter_executables
+from pe_rank import rank_executables
+
+DEFAULT_CONCURRENCY = 8
+# Search threads alive at once, abandoned ones included, per concurrency slot
+THREADS_PER_SLOT = 2
+
+# Queued by the registry reader after its last game
+_DONE = object()
+
+
+class ScanReport:
+    """
+    Result of scan_async. timed_out holds the games (also in games) whose
+    executable search hit its deadline; their executables are partial.
+    cancelled is True when the stop event ended the scan early.
+    """
+
+    def __init__(self, games, timed_out, cancelled):
+        self.games = games
+        self.timed_out = timed_out
+        self.cancelled = cancelled
+
+    def __repr__(self):
+        return (f"ScanReport(games={len(self.games)}, timed_out={len(self.timed_out)}, "
+                f"cancelled={self.cancelled})")
+
+
+def _run_in_thread(loop, fn, *args, on_exit=None):
+    """
+    Run fn(*args) on a new daemon thread and return an asyncio future for
+    its result. Unlike an executor, nothing waits for the thread at exit.
+    on_exit, if given, is called on the loop once the thread is done, even
+    if the future was cancelled.
+    """
+    future = loop.create_future()
+
+    def settle(result, error):
+        if future.cancelled():
+            return
+        if error is not None:
+            future.set_exception(error)
+        else:
+            future.set_result(result)
+
+    def run():
+        try:
+            result, error = fn(*args), None
+        except BaseException as e:  # handed to the awaiting task
+            result, error = None, e
+        try:
+            loop.call_soon_threadsafe(settle, result, error)
+            if on_exit is not None:
+                loop.call_soon_threadsafe(on_exit)
+        except RuntimeError:  # loop closed while the thread was blocked
+            pass
+
+    threading.Thread(target=run, name="async-scan", daemon=True).start()
+    return future
+
+
+def _search(location, game_name, found, limit, max_depth, pe_cache, abandon):
+    """
+    Executable search for one location that appends candidates to found as
+    it goes, so a caller that gives up still has the partial list.
+    Returns None once abandoned.
+    """
+    candidates = []
+    if not location:
+        return []
+    walk = iter_executables(location, max_depth)
+    try:
+        for exe in walk:
+            if abandon.is_set():
+                return None
+            candidates.append(exe)
+            found.append(exe)
+            if len(candidates) >= limit * scanner.RANK_POOL_FACTOR:
+                break
+    finally:
+        walk.close()
+    if abandon.is_set():
+        return None
+    return rank_executables(candidates, location, game_name, pe_cache)[:limit]
+
+
+async def iter_games(source=None, classifier=None, location_filter=scanner.is_on_d_drive, location_timeout=None,
+                     concurrency=DEFAULT_CONCURRENCY, limit=DEFAULT_LIMIT, max_depth=DEFAULT_MAX_DEPTH,
+                     cache=None, stats=None, steam_root=None, merge=False, pe_cache=None, stop=None, timed_out=None,
+                     max_threads=None):
+    """
+    Async generator of games with their executables, in completion order.
+
+    location_timeout is the deadline in seconds for each install location's
+    search. A game whose search timed out is still yielded, with the
+    executables found before the deadline (unranked), and is appended to
+    the timed_out list if one is given.
+
+    max_threads caps the search threads alive at once, abandoned ones
+    included (default concurrency * THREADS_PER_SLOT). Once stuck threads
+    use it up, a game waits for one of them to exit until its deadline and
+    is then reported as timed out with no executables.
+
+    stop, an asyncio.Event, ends the scan as soon as it is set: the
+    generator returns without waiting for another game, running searches
+    are abandoned and queued ones never start. Task cancellation abandons
+    in-flight searches the same way.
+    The remaining arguments are those of FindGamesInstalled.iter_games.
+    """
+    loop = asyncio.get_running_loop()
+    semaphore = asyncio.Semaphore(concurrency)
+    threads = asyncio.Semaphore(max_threads or concurrency * THREADS_PER_SLOT)
+    arrivals = asyncio.Queue()
+    closing = threading.Event()
+
+    def read_registry():
+        games = scanner.iter_games(source, classifier, location_filter, find_exes=False, workers=concurrency,
+                                   cache=cache, stats=stats, steam_root=steam_root, merge=merge)
+        try:
+            for game in games:
+                if closing.is_set():
+                    break
+                loop.call_soon_threadsafe(arrivals.put_nowait, game)
+        finally:
+            games.close()
+            loop.call_soon_threadsafe(arrivals.put_nowait, _DONE)
+
+    async def search(game):
+        found = []
+        abandon = threading.Event()
+        async with semaphore:
+            deadline = None if location_timeout is None else loop.time() + location_timeout
+            try:
+                await asyncio.wait_for(threads.acquire(), location_timeout)
+            except asyncio.TimeoutError:
+                # Every thread in the budget is stuck on an earlier location
+                game.executables = []
+                return game, True
+            future = _run_in_thread(loop, _search, game.install_location, game.name, found,
+                                    limit, max_depth, pe_cache, abandon, on_exit=threads.release)
+            try:
+                remaining = None if deadline is None else max(0.0, deadline - loop.time())
+                game.executables = await asyncio.wait_for(future, remaining)
+                return game, False
+            except asyncio.TimeoutError:
+                abandon.set()
+                game.executables = found[:limit]
+                return game, True
+            except asyncio.CancelledError:
+                abandon.set()
+                raise
+
+    tasks = set()
+    stop_wait = asyncio.ensure_future(stop.wait()) if stop is not None else None
+    registry = _run_in_thread(loop, read_registry)
+    arrival = asyncio.ensure_future(arrivals.get())
+    try:
+        while tasks or arrival is not None:
+            waiting = set(tasks)
+            if arrival is not None:
+                waiting.add(arrival)
+            if stop_wait is not None:
+                waiting.add(stop_wait)
+            done, _ = await asyncio.wait(waiting, return_when=asyncio.FIRST_COMPLETED)
+            if stop_wait is not None and stop_wait.done():
+                # The finally block cancels every search, running or still queued
+                return
+            if arrival in done:
+                game = arrival.result()
+                if game is _DONE:
+                    arrival = None
+                    # Raises if the registry read failed
+                    await registry
+                else:
+                    tasks.add(asyncio.ensure_future(search(game)))
+                    arrival = asyncio.ensure_future(arrivals.get())
+            for task in done & tasks:
+                tasks.discard(task)
+                game, expired = task.result()
+                if expired:
+                    scanner._count(stats, 'timed_out')
+                    if timed_out is not None:
+                        timed_out.append(game)
+                yield game
+                if stop is not None and stop.is_set():
+                    return
+    finally:
+        closing.set()
+        for pending in (registry, arrival, stop_wait, *tasks):
+            if pending is not None:
+                pending.cancel()
+
+
+async def scan_async(stop=None, **kwargs):
+    """
+    Run iter_games to completion (or until stop is set) and return a
+    ScanReport. Takes the keyword arguments of iter_games.
+    """
+    games = []
+    timed_out = []
+    async for game in iter_games(stop=stop, timed_out=timed_out, **kwargs):
+        games.append(game)
+    cancelled = stop is not None and stop.is_set()
+    return ScanReport(games, timed_out, cancelled)
@@ -0,0 +1,191 @@
+"""
+Benchmarks for the game scanner.
+
+    python benchmark.py classifier [--sizes 1000 10000 100000]
+    python benchmark.py records [--count 100000]
+    python benchmark.py stages [--counts 1000 10000 100000] [--games 50]
+                               [--output results.json] [--baseline baseline.json]
+
+The stages benchmark times every scan stage on synthetic data (see
+synthetic.py) and compares the timings with a baseline, by default the
+stored benchmark_baseline.json next to this script. It exits non-zero when
+a stage got slower than the baseline by more than --threshold. Refresh
+the stored baseline with --output benchmark_baseline.json after an
+intended change.
+"""
+import argparse
+import json
+import os
+import platform
+import sys
+import tempfile
+import time
+import tracemalloc
+
+from classifier import GameClassifier
+from FindGamesInstalled import (UNINSTALL_PATHS, extract_program_info, filter_games_on_d_drive,
+                                find_game_executables, is_likely_game, iter_games)
+from path_index import location_filter
+from records import Program, ProgramTable
+from registry_source import SnapshotSource
+from synthetic import synthetic_install_tree, synthetic_programs, synthetic_registry
+
+RESULTS_VERSION = 1
+DEFAULT_THRESHOLD = 1.25
+BASELINE_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "benchmark_baseline.json")
+
+def bench_classifier(sizes, repeat=3):
+    classifier = GameClassifier()
+    print(f"{'entries':>10} {'best s':>10} {'us/entry':>10}")
+    for size in sizes:
+        programs = synthetic_programs(size)
+        best = min(_time(classifier.classify, programs) for _ in range(repeat))
+        print(f"{size:>10} {best:>10.4f} {best / size * 1e6:>10.3f}")
+
+
+def bench_records(count):
+    """
+    Memory retained by count programs stored as dicts, Program records and a
+    ProgramTable, strings included.
+    """
+    layouts = [
+        ("dict", lambda rows: [dict(row) for row in rows]),
+        ("Program", lambda rows: [Program(row['name'], row['install_location'], row['publisher']) for row in rows]),
+        ("ProgramTable", ProgramTable),
+    ]
+    print(f"{'layout':>14} {'MiB':>10} {'bytes/record':>14}")
+    for label, build in layouts:
+        tracemalloc.start()
+        rows = synthetic_programs(count)
+        held = build(rows)
+        del rows
+        size = tracemalloc.get_traced_memory()[0]
+        tracemalloc.stop()
+        del held
+        print(f"{label:>14} {size / 2**20:>10.1f} {size / count:>14.1f}")
+
+
+def _uninstall_values(data):
+    values = []
+    for hive, path in UNINSTALL_PATHS:
+        node = data.get(hive, {})
+        for part in path.split("\\"):
+            node = node.get("subkeys", {}).get(part, {})
+        values.extend(entry["values"] for entry in node.get("subkeys", {}).values())
+    return values
+
+
+def bench_stages(counts, games, repeat=3):
+    """
+    Best-of-repeat seconds per stage, as {"stage/size": seconds}.
+
+    The per-record stages run on count registry entries. Executable
+    discovery and the end-to-end scan run on games synthetic install trees;
+    the end-to-end scan reads a snapshot of the largest count whose game
+    entries point into those trees, with no scan cache.
+    """
+    timings = {}
+    for count in counts:
+        values = _uninstall_values(synthetic_registry(count))
+        timings[f"extract_program_info/{count}"] = _best(repeat, lambda: [extract_program_info(v) for v in values])
+        programs = [program for program in map(extract_program_info, values) if program is not None]
+        timings[f"is_likely_game/{count}"] = _best(repeat, lambda: [is_likely_game(p) for p in programs])
+        timings[f"filter_games_on_d_drive/{count}"] = _best(repeat, lambda: filter_games_on_d_drive(programs))
+
+    with tempfile.TemporaryDirectory(prefix="findgames-bench-") as root:
+        locations = synthetic_install_tree(root, games)
+        timings[f"find_game_executables/{games}"] = _best(
+            repeat, lambda: [find_game_executables(location, game_name=f"Game{i:05d}")
+                             for i, location in enumerate(locations)])
+
+        count = max(counts)
+        source = SnapshotSource(synthetic_registry(count, steam_apps=count // 100, install_locations=locations))
+        under_root = location_filter([root])
+        timings[f"end_to_end/{count}"] = _best(
+            repeat, lambda: sum(1 for _ in iter_games(source, location_filter=under_root, cache=None)))
+    return timings
+
+
+def compare_to_baseline(timings, baseline, threshold=DEFAULT_THRESHOLD):
+    """
+    Return [(stage, baseline_s, current_s, ratio)] for every stage that is
+    slower than threshold times its baseline. Stages missing from either
+    side are ignored.
+    """
+    regressions = []
+    for stage, seconds in timings.items():
+        before = baseline.get(stage)
+        if before and seconds / before > threshold:
+            regressions.append((stage, before, seconds, seconds / before))
+    return regressions
+
+
+def run_stages(args):
+    timings = bench_stages(args.counts, args.games, args.repeat)
+    print(f"{'stage':>36} {'best s':>10}")
+    for stage, seconds in timings.items():
+        print(f"{stage:>36} {seconds:>10.4f}")
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump({
+                "version": RESULTS_VERSION,
+                "python": sys.version.split()[0],
+                "platform": platform.platform(),
+                "timings": timings,
+            }, f, indent=2)
+
+    if not args.baseline:
+        return 0
+    with open(args.baseline, "r", encoding="utf-8") as f:
+        baseline = json.load(f).get("timings", {})
+    regressions = compare_to_baseline(timings, baseline, args.threshold)
+    for stage, before, seconds, ratio in regressions:
+        print(f"REGRESSION {stage}: {before:.4f}s -> {seconds:.4f}s ({ratio:.2f}x)")
+    if not regressions:
+        print(f"No stage slower than {args.threshold:.2f}x baseline")
+    return 1 if regressions else 0
+
+
+def _best(repeat, fn):
+    return min(_time(fn) for _ in range(repeat))
+
+
+def _time(fn, *args):
+    start = time.perf_counter()
+    fn(*args)
+    return time.perf_counter() - start
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Game scanner benchmarks")
+    sub = parser.add_subparsers(dest="bench", required=True)
+    classifier_parser = sub.add_parser("classifier", help="classifier scaling")
+    classifier_parser.add_argument("--sizes", type=int, nargs="+", default=[1000, 10000, 100000])
+    records_parser = sub.add_parser("records", help="per-record memory")
+    records_parser.add_argument("--count", type=int, default=100000)
+    stages_parser = sub.add_parser("stages", help="per-stage and end-to-end timings")
+    stages_parser.add_argument("--counts", type=int, nargs="+", default=[1000, 10000, 100000],
+                               help="registry entries per run")
+    stages_parser.add_argument("--games", type=int, default=50, help="synthetic install trees to crawl")
+    stages_parser.add_argument("--repeat", type=int, default=3)
+    stages_parser.add_argument("--output", help="write the timings as JSON")
+    stages_parser.add_argument("--baseline", default=BASELINE_FILE if os.path.exists(BASELINE_FILE) else None,
+                               help="compare against timings written by --output (default: benchmark_baseline.json)")
+    stages_parser.add_argument("--no-baseline", dest="baseline", action="store_const", const=None,
+                               help="do not compare against a baseline")
+    stages_parser.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD,
+                               help="slowdown ratio that counts as a regression")
+    args = parser.parse_args(argv)
+
+    if args.bench == "classifier":
+        bench_classifier(args.sizes)
+    elif args.bench == "records":
+        bench_records(args.count)
+    elif args.bench == "stages":
+        return run_stages(args)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
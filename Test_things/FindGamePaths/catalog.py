@@ -0,0 +1,247 @@
+"""
+Persistent SQLite catalog of scanned programs.
+
+A scan writes every program with its classification, and the executables
+found for games, so later questions ("where is X installed?", "all Ubisoft
+titles") are answered from the catalog instead of a rescan. Names and
+publishers are indexed with FTS5 when SQLite has it. Writes are batched in
+transactions and upserted, so rows that did not change are not rewritten.
+
+Rows are keyed on where a program was found (its registry key, or its
+Steam app id), not on its name and path: without --merge the same install
+is reported by several keys, and each gets its own stable row.
+"""
+import json
+import os
+import sqlite3
+import time
+
+from merge import merge_key
+from scan_cache import default_cache_dir
+
+# Bump when the schema changes; older catalogs are rebuilt by the next scan
+SCHEMA_VERSION = 2
+BATCH_SIZE = 500
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS programs (
+    id INTEGER PRIMARY KEY,
+    source_key TEXT NOT NULL UNIQUE,
+    name TEXT NOT NULL,
+    install_location TEXT,
+    publisher TEXT,
+    app_id TEXT,
+    source TEXT,
+    is_game INTEGER NOT NULL,
+    fingerprint TEXT NOT NULL,
+    updated_at REAL NOT NULL
+);
+CREATE TABLE IF NOT EXISTS executables (
+    program_id INTEGER NOT NULL REFERENCES programs(id) ON DELETE CASCADE,
+    rank INTEGER NOT NULL,
+    path TEXT NOT NULL,
+    PRIMARY KEY (program_id, rank)
+);
+"""
+
+_FTS_SCHEMA = """
+CREATE VIRTUAL TABLE IF NOT EXISTS programs_fts USING fts5(
+    name, publisher, content='programs', content_rowid='id'
+);
+CREATE TRIGGER IF NOT EXISTS programs_ai AFTER INSERT ON programs BEGIN
+    INSERT INTO programs_fts(rowid, name, publisher) VALUES (new.id, new.name, new.publisher);
+END;
+CREATE TRIGGER IF NOT EXISTS programs_ad AFTER DELETE ON programs BEGIN
+    INSERT INTO programs_fts(programs_fts, rowid, name, publisher) VALUES ('delete', old.id, old.name, old.publisher);
+END;
+CREATE TRIGGER IF NOT EXISTS programs_au AFTER UPDATE OF name, publisher ON programs BEGIN
+    INSERT INTO programs_fts(programs_fts, rowid, name, publisher) VALUES ('delete', old.id, old.name, old.publisher);
+    INSERT INTO programs_fts(rowid, name, publisher) VALUES (new.id, new.name, new.publisher);
+END;
+"""
+
+_DROP_SCHEMA = """
+DROP TRIGGER IF EXISTS programs_ai;
+DROP TRIGGER IF EXISTS programs_ad;
+DROP TRIGGER IF EXISTS programs_au;
+DROP TABLE IF EXISTS programs_fts;
+DROP TABLE IF EXISTS executables;
+DROP TABLE IF EXISTS programs;
+"""
+
+_UPSERT = """
+INSERT INTO programs (source_key, name, install_location, publisher, app_id, source, is_game, fingerprint, updated_at)
+VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+ON CONFLICT(source_key) DO UPDATE SET
+    name = excluded.name,
+    install_location = excluded.install_location,
+    publisher = excluded.publisher,
+    app_id = excluded.app_id,
+    source = excluded.source,
+    is_game = excluded.is_game,
+    fingerprint = excluded.fingerprint,
+    updated_at = excluded.updated_at
+WHERE programs.fingerprint != excluded.fingerprint
+"""
+
+
+def default_catalog_path():
+    return os.path.join(default_cache_dir(), "catalog.sqlite")
+
+
+def _catalog_key(program):
+    # Programs built outside the scanner may have no source identity
+    return program.get('source_key') or "\x1f".join(merge_key(program))
+
+
+class GameCatalog:
+    """
+    Read/write access to the catalog database.
+
+    During a scan call record_program() for every program and
+    record_executables() for every game whose executables were searched,
+    then finish_scan(). Counters: inserted_or_updated, unchanged, removed.
+    """
+
+    def __init__(self, path=None):
+        self.path = path or default_catalog_path()
+        os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+        self.conn = sqlite3.connect(self.path)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self.conn.execute("PRAGMA foreign_keys=ON")
+        with self.conn:
+            version = self.conn.execute("PRAGMA user_version").fetchone()[0]
+            if version != SCHEMA_VERSION:
+                # Only a cache of scan results, so an old layout is dropped rather than migrated
+                self.conn.executescript(_DROP_SCHEMA)
+            self.conn.executescript(_SCHEMA)
+            try:
+                self.conn.executescript(_FTS_SCHEMA)
+                self.has_fts = True
+            except sqlite3.OperationalError:  # SQLite built without FTS5
+                self.has_fts = False
+            self.conn.execute(f"PRAGMA user_version={SCHEMA_VERSION}")
+
+        self._pending_programs = []
+        self._pending_executables = []
+        self._seen_keys = set()
+        self.inserted_or_updated = 0
+        self.unchanged = 0
+        self.removed = 0
+
+    def close(self):
+        self.conn.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    # Writing
+
+    def record_program(self, program, is_game):
+        key = _catalog_key(program)
+        self._seen_keys.add(key)
+        row = (program['name'], program['install_location'], program['publisher'],
+               program.get('app_id'), program.get('source'), int(bool(is_game)))
+        fingerprint = json.dumps(row)
+        self._pending_programs.append((key,) + row + (fingerprint, time.time()))
+        if len(self._pending_programs) >= BATCH_SIZE:
+            self.flush()
+
+    def record_executables(self, program):
+        executables = program.get('executables')
+        if executables is None:
+            return
+        self._pending_executables.append((_catalog_key(program), list(executables)))
+        if len(self._pending_executables) >= BATCH_SIZE:
+            self.flush()
+
+    def flush(self):
+        """
+        Write pending rows in one transaction.
+        """
+        if not self._pending_programs and not self._pending_executables:
+            return
+        with self.conn:
+            if self._pending_programs:
+                # rowcount counts rows the upsert actually wrote, not FTS trigger writes
+                changed = self.conn.executemany(_UPSERT, self._pending_programs).rowcount
+                self.inserted_or_updated += changed
+                self.unchanged += len(self._pending_programs) - changed
+            for key, executables in self._pending_executables:
+                row = self.conn.execute("SELECT id FROM programs WHERE source_key = ?", (key,)).fetchone()
+                if row is None:
+                    continue
+                current = [path for (path,) in self.conn.execute(
+                    "SELECT path FROM executables WHERE program_id = ? ORDER BY rank", row)]
+                if current == executables:
+                    continue
+                self.conn.execute("DELETE FROM executables WHERE program_id = ?", row)
+                self.conn.executemany("INSERT INTO executables (program_id, rank, path) VALUES (?, ?, ?)",
+                                      [(row[0], rank, path) for rank, path in enumerate(executables)])
+        self._pending_programs = []
+        self._pending_executables = []
+
+    def finish_scan(self, prune=True):
+        """
+        Flush and, with prune=True, delete programs the scan did not see.
+        Only prune after a complete scan.
+        """
+        self.flush()
+        if not prune:
+            return
+        with self.conn:
+            self.conn.execute("CREATE TEMP TABLE IF NOT EXISTS seen_keys (source_key TEXT PRIMARY KEY)")
+            self.conn.execute("DELETE FROM seen_keys")
+            self.conn.executemany("INSERT OR IGNORE INTO seen_keys VALUES (?)", ((key,) for key in self._seen_keys))
+            cursor = self.conn.execute("DELETE FROM programs WHERE source_key NOT IN (SELECT source_key FROM seen_keys)")
+            self.removed += cursor.rowcount
+        self._seen_keys = set()
+
+    # Reading
+
+    def search(self, text, games_only=False, limit=50):
+        """
+        Programs whose name or publisher match text, as dicts with an
+        'executables' list. Every word of text must match a word prefix.
+        """
+        words = [word for word in text.split() if word]
+        if not words:
+            return []
+        game_filter = " AND p.is_game = 1" if games_only else ""
+        if self.has_fts:
+            match = " ".join('"' + word.replace('"', '""') + '"*' for word in words)
+            rows = self.conn.execute(
+                "SELECT p.id, p.name, p.install_location, p.publisher, p.app_id, p.source, p.is_game "
+                "FROM programs_fts f JOIN programs p ON p.id = f.rowid "
+                f"WHERE programs_fts MATCH ?{game_filter} ORDER BY f.rank LIMIT ?",
+                (match, limit)).fetchall()
+        else:
+            conditions = " AND ".join("(p.name LIKE ? OR p.publisher LIKE ?)" for _ in words)
+            params = [value for word in words for value in (f"%{word}%", f"%{word}%")]
+            rows = self.conn.execute(
+                "SELECT p.id, p.name, p.install_location, p.publisher, p.app_id, p.source, p.is_game "
+                f"FROM programs p WHERE {conditions}{game_filter} ORDER BY p.name LIMIT ?",
+                params + [limit]).fetchall()
+        return [self._row_to_dict(row) for row in rows]
+
+    def _row_to_dict(self, row):
+        program_id, name, install_location, publisher, app_id, source, is_game = row
+        executables = [path for (path,) in self.conn.execute(
+            "SELECT path FROM executables WHERE program_id = ? ORDER BY rank", (program_id,))]
+        return {
+            'name': name,
+            'install_location': install_location,
+            'publisher': publisher,
+            'app_id': app_id,
+            'source': source,
+            'is_game': bool(is_game),
+            'executables': executables,
+        }
+
+    def count(self, games_only=False):
+        query = "SELECT COUNT(*) FROM programs" + (" WHERE is_game = 1" if games_only else "")
+        return self.conn.execute(query).fetchone()[0]
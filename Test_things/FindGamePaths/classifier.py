@@ -0,0 +1,101 @@
+"""
+Keyword based game classifier.
+
+Every keyword list is compiled once into a single alternation regex, so
+classifying a program is one search per list instead of a Python loop over
+every keyword.
+"""
+import re
+
+# Game publishers and platforms
+GAME_PUBLISHERS = [
+    'steam', 'valve', 'epic games', 'electronic arts', 'ea', 'ubisoft',
+    'activision', 'blizzard', 'bethesda', 'cd projekt', 'rockstar',
+    'square enix', 'capcom', 'konami', 'sega', 'nintendo', 'sony',
+    'microsoft studios', 'xbox game studios', 'riot games', 'epic',
+    'gog', 'origin', 'battle.net'
+]
+
+# Game-related keywords
+GAME_KEYWORDS = [
+    'game', 'games', 'simulator', 'racing', 'adventure', 'rpg',
+    'strategy', 'action', 'shooter', 'warfare', 'battle', 'combat',
+    'quest', 'fantasy', 'online', 'multiplayer', 'edition'
+]
+
+# Non-game keywords (to exclude)
+NON_GAME_KEYWORDS = [
+    'microsoft', 'adobe', 'driver', 'update', 'runtime', 'framework',
+    'redistributable', 'tool', 'utility', 'browser', 'antivirus',
+    'office', 'visual studio', 'windows'
+]
+
+
+def compile_terms(terms):
+    """
+    Compile substrings into one regex that matches if any of them occurs.
+    Returns None for an empty list.
+    """
+    terms = sorted({term.lower() for term in terms if term}, key=len, reverse=True)
+    if not terms:
+        return None
+    return re.compile("|".join(re.escape(term) for term in terms))
+
+
+class GameClassifier:
+    """
+    Decide whether programs are likely games.
+
+    Precedence, first match wins:
+      1. overrides: exact program name (case-insensitive) -> True/False
+      2. deny: name contains a denied term -> False
+      3. allow: name contains an allowed term -> True
+      4. publisher contains a game publisher -> True
+      5. name contains a non-game keyword -> False
+      6. name contains a game keyword -> True
+    Everything else is not a game.
+    """
+
+    def __init__(self, publishers=GAME_PUBLISHERS, game_keywords=GAME_KEYWORDS,
+                 non_game_keywords=NON_GAME_KEYWORDS, allow=(), deny=(), overrides=None):
+        self._publishers = compile_terms(publishers)
+        self._game_keywords = compile_terms(game_keywords)
+        self._non_game_keywords = compile_terms(non_game_keywords)
+        self._allow = compile_terms(allow)
+        self._deny = compile_terms(deny)
+        self._overrides = {name.lower(): bool(value) for name, value in (overrides or {}).items()}
+
+    def is_game(self, program):
+        name = program['name']
+        if not name:
+            return False
+
+        name_lower = name.lower()
+        if self._overrides:
+            override = self._overrides.get(name_lower)
+            if override is not None:
+                return override
+
+        if self._deny and self._deny.search(name_lower):
+            return False
+        if self._allow and self._allow.search(name_lower):
+            return True
+
+        publisher = program['publisher']
+        if publisher and self._publishers and self._publishers.search(publisher.lower()):
+            return True
+
+        if self._non_game_keywords and self._non_game_keywords.search(name_lower):
+            return False
+
+        return bool(self._game_keywords and self._game_keywords.search(name_lower))
+
+    def classify(self, programs):
+        """
+        Return a list of booleans, one per program.
+        """
+        is_game = self.is_game
+        return [is_game(program) for program in programs]
+
+
+DEFAULT_CLASSIFIER = GameClassifier()
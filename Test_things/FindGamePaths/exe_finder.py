@@ -0,0 +1,115 @@
+"""
+Executable discovery inside game install directories.
+
+A breadth-first os.scandir walk: shallow directories are visited first, the
+depth is bounded, known asset/redistributable folders are never entered,
+and the walk stops as soon as enough executables were found. scandir
+entries carry the file type, so matching needs no extra stat call.
+"""
+import os
+from collections import deque
+
+DEFAULT_MAX_DEPTH = 5
+DEFAULT_LIMIT = 5
+
+# Skip obvious non-game executables
+SKIP_EXE_NAMES = ['unins', 'setup', 'install', 'update', 'redist', 'crash']
+
+# Directory names that never hold the game binary (compared lowercase)
+PRUNE_DIR_NAMES = {
+    '_commonredist', 'commonredist', 'redist', 'redistributables', 'directx',
+    'vcredist', 'dotnet', '__installer', 'installers', 'support',
+    '$recycle.bin', 'shadercache', 'crashreports', 'logs', 'saves', 'screenshots',
+}
+
+# Relative path suffixes that are asset trees (compared lowercase)
+PRUNE_DIR_SUFFIXES = [
+    ('engine', 'content'),
+    ('engine', 'binaries', 'thirdparty'),
+    ('engine', 'extras'),
+    ('content', 'paks'),
+    ('content', 'movies'),
+    ('streamingassets',),
+]
+
+
+def is_pruned(parts):
+    """
+    True if a directory, given as its lowercase path parts relative to the
+    install root, should not be entered.
+    """
+    if parts[-1] in PRUNE_DIR_NAMES:
+        return True
+    for suffix in PRUNE_DIR_SUFFIXES:
+        if tuple(parts[-len(suffix):]) == suffix:
+            return True
+    return False
+
+
+def iter_executables(root, max_depth=DEFAULT_MAX_DEPTH, skip_names=SKIP_EXE_NAMES, stats=None):
+    """
+    Yield paths of .exe files under root, shallowest directories first.
+    root itself is depth 0. Unreadable directories are skipped.
+
+    stats, if given, is a dict that receives the number of directories
+    visited, executables matched and permission errors skipped. It is
+    updated when the generator finishes or is closed.
+    """
+    visited = matched = denied = 0
+    queue = deque([(root, (), 0)])
+    try:
+        while queue:
+            path, parts, depth = queue.popleft()
+            try:
+                with os.scandir(path) as it:
+                    entries = sorted(it, key=lambda entry: entry.name.lower())
+            except PermissionError:
+                denied += 1
+                continue
+            except OSError:
+                continue
+            visited += 1
+
+            subdirs = []
+            for entry in entries:
+                name = entry.name.lower()
+                try:
+                    if entry.is_dir(follow_symlinks=False):
+                        subdirs.append((entry, name))
+                    elif name.endswith(".exe") and entry.is_file():
+                        if not any(skip in name for skip in skip_names):
+                            matched += 1
+                            yield entry.path
+                except OSError:
+                    continue
+
+            if depth >= max_depth:
+                continue
+            for entry, name in subdirs:
+                child_parts = parts + (name,)
+                if not is_pruned(child_parts):
+                    queue.append((entry.path, child_parts, depth + 1))
+    finally:
+        if stats is not None:
+            stats['directories_visited'] = stats.get('directories_visited', 0) + visited
+            stats['exes_matched'] = stats.get('exes_matched', 0) + matched
+            stats['permission_errors'] = stats.get('permission_errors', 0) + denied
+
+
+def find_executables(install_location, limit=DEFAULT_LIMIT, max_depth=DEFAULT_MAX_DEPTH, stats=None):
+    """
+    Return up to limit executables from an install directory.
+    stats is passed on to iter_executables.
+    """
+    if not install_location or not os.path.isdir(install_location):
+        return []
+
+    executables = []
+    walk = iter_executables(install_location, max_depth, stats=stats)
+    for exe in walk:
+        executables.append(exe)
+        if len(executables) >= limit:
+            break
+    walk.close()
+    return executables
+
@@ -0,0 +1,100 @@
+"""
+Deduplicating merge of programs from several sources.
+
+The same install often shows up in HKLM and WOW6432Node, or in both an
+Uninstall hive and Steam. Programs are grouped in one pass through a hash
+index on (normalized name, normalized install path) and each group is
+collapsed into a single Program, field by field, following a source
+precedence.
+"""
+import ntpath
+import re
+
+from records import FIELDS, Program
+
+SOURCE_HKLM = "hklm"
+SOURCE_HKLM_WOW64 = "hklm-wow64"
+SOURCE_HKCU = "hkcu"
+SOURCE_STEAM = "steam"
+
+# Highest priority first. Sources not listed rank below all listed ones.
+DEFAULT_PRECEDENCE = (SOURCE_STEAM, SOURCE_HKLM, SOURCE_HKLM_WOW64, SOURCE_HKCU)
+
+# Per-field precedence that differs from the record precedence. Steam
+# records always say "Steam" as publisher, so the registry one is better.
+DEFAULT_FIELD_PRECEDENCE = {
+    'publisher': (SOURCE_HKLM, SOURCE_HKLM_WOW64, SOURCE_HKCU, SOURCE_STEAM),
+}
+
+_NON_WORD = re.compile(r"[\W_]+")
+_MARKS = str.maketrans("", "", "™®©")  # TM, (R), (C)
+
+
+def normalize_name(name):
+    """
+    Case-folded name with trademark signs and punctuation collapsed.
+    """
+    return _NON_WORD.sub(" ", (name or "").translate(_MARKS).casefold()).strip()
+
+
+def normalize_path(path):
+    """
+    Case-folded Windows path with separators unified and no trailing slash.
+    """
+    if not path:
+        return ""
+    return ntpath.normcase(ntpath.normpath(path.strip().strip('"'))).rstrip("\\")
+
+
+def merge_key(program):
+    return normalize_name(program['name']), normalize_path(program['install_location'])
+
+
+def _rank(precedence):
+    ranks = {source: i for i, source in enumerate(precedence)}
+    return lambda program: ranks.get(program.get('source'), len(ranks))
+
+
+def _merge_group(group, rank, field_ranks, fields):
+    if len(group) == 1:
+        return group[0]
+    ordered = sorted(group, key=rank)
+    merged = {}
+    for field in fields:
+        candidates = sorted(group, key=field_ranks[field]) if field in field_ranks else ordered
+        merged[field] = next((p[field] for p in candidates if p.get(field) is not None), None)
+    merged['source'] = ordered[0].get('source')
+    merged['source_key'] = ordered[0].get('source_key')
+    return Program.from_dict(merged)
+
+
+def merge_programs(programs, precedence=DEFAULT_PRECEDENCE, field_precedence=None):
+    """
+    Collapse duplicate programs and return the survivors in first-seen order.
+
+    Programs with the same normalized name and install path are merged.
+    A program without an install path also merges into the first program
+    with the same name. For every field the value comes from the highest
+    precedence record that has one; field_precedence overrides the order
+    for single fields (default: DEFAULT_FIELD_PRECEDENCE). source and
+    source_key are those of the highest precedence record.
+    """
+    if field_precedence is None:
+        field_precedence = DEFAULT_FIELD_PRECEDENCE
+    rank = _rank(precedence)
+    field_ranks = {field: _rank(order) for field, order in field_precedence.items()}
+
+    groups = {}
+    for program in programs:
+        groups.setdefault(merge_key(program), []).append(program)
+
+    # Fold path-less groups into the first group with the same name
+    first_by_name = {}
+    for name, path in groups:
+        if path:
+            first_by_name.setdefault(name, (name, path))
+    for key in [key for key in groups if not key[1] and key[0] in first_by_name]:
+        groups[first_by_name[key[0]]].extend(groups.pop(key))
+
+    fields = [field for field in FIELDS if field not in ('source', 'source_key')]
+    return [_merge_group(group, rank, field_ranks, fields) for group in groups.values()]
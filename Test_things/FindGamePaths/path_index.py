@@ -0,0 +1,144 @@
+"""
+Path-prefix index over install locations.
+
+Paths are split into normalized, case-folded components and stored in a
+trie, so "everything under X" costs a walk down X's components plus the
+size of the answer, whatever the number of indexed programs. Works the
+other way round too: a trie of query prefixes tells in one walk down a
+program's path which queries contain it.
+"""
+import ntpath
+
+from merge import normalize_path
+
+
+def path_components(path):
+    """
+    Split a Windows path into trie components. The first component is the
+    volume: "d:", "\\\\server\\share", or "\\" for paths without a drive.
+    """
+    normalized = normalize_path(path)
+    if not normalized:
+        return []
+    drive, rest = ntpath.splitdrive(normalized)
+    return [drive or "\\"] + [part for part in rest.split("\\") if part]
+
+
+def volume_label(component):
+    """
+    Display form of a volume component ("d:" -> "D:").
+    """
+    if len(component) == 2 and component[1] == ":":
+        return component.upper()
+    return component
+
+
+class _Node:
+    __slots__ = ('children', 'values')
+
+    def __init__(self):
+        self.children = {}
+        self.values = []
+
+
+class PathTrie:
+    """
+    Maps path prefixes to the values stored at or below them.
+    """
+
+    def __init__(self):
+        self._root = _Node()
+        self._size = 0
+
+    def __len__(self):
+        return self._size
+
+    def insert(self, path, value):
+        components = path_components(path)
+        if not components:
+            return False
+        node = self._root
+        for component in components:
+            child = node.children.get(component)
+            if child is None:
+                child = node.children[component] = _Node()
+            node = child
+        node.values.append(value)
+        self._size += 1
+        return True
+
+    def _find(self, components):
+        node = self._root
+        for component in components:
+            node = node.children.get(component)
+            if node is None:
+                return None
+        return node
+
+    def under(self, prefix):
+        """
+        Values stored at prefix or anywhere below it, in depth-first order.
+        """
+        node = self._find(path_components(prefix))
+        return self._collect(node) if node is not None else []
+
+    def prefixes_of(self, path):
+        """
+        Values stored at path or at any of its ancestors, shortest prefix first.
+        """
+        found = []
+        node = self._root
+        for component in path_components(path):
+            node = node.children.get(component)
+            if node is None:
+                break
+            found.extend(node.values)
+        return found
+
+    def volumes(self):
+        """
+        {volume label: values on that volume}.
+        """
+        return {volume_label(component): self._collect(node) for component, node in self._root.children.items()}
+
+    @staticmethod
+    def _collect(node):
+        found = []
+        stack = [node]
+        while stack:
+            node = stack.pop()
+            found.extend(node.values)
+            stack.extend(reversed(list(node.children.values())))
+        return found
+
+
+class ProgramPathIndex(PathTrie):
+    """
+    PathTrie of programs keyed on their install location. Programs without
+    an install location are not indexed.
+    """
+
+    def __init__(self, programs=()):
+        super().__init__()
+        for program in programs:
+            self.add(program)
+
+    def add(self, program):
+        return self.insert(program['install_location'], program)
+
+
+def location_filter(prefixes):
+    """
+    Predicate for iter_games that accepts programs installed under any of
+    the given folders. Cost per program is bounded by its path depth, not
+    by the number of prefixes.
+    """
+    trie = PathTrie()
+    for prefix in prefixes:
+        trie.insert(prefix, prefix)
+
+    def is_under(program):
+        location = program['install_location']
+        return bool(location) and bool(trie.prefixes_of(location))
+
+    return is_under
@@ -0,0 +1,213 @@
+"""
+Rank candidate executables by their PE headers.
+
+Each candidate is memory-mapped and only the pages holding the DOS/PE
+headers, the section table and the top of the resource directory are
+touched. The header facts (subsystem, machine, version resource) are
+combined with file size, directory depth and name hints into a score.
+Header facts are cached by (path, size, mtime), so reranking a library
+does not read files that did not change.
+"""
+import math
+import mmap
+import os
+import struct
+import threading
+
+from scan_cache import default_cache_dir, load_json_cache, save_json_cache
+
+PE_CACHE_VERSION = 1
+
+# IMAGE_FILE_MACHINE_*
+MACHINE_I386 = 0x014C
+MACHINE_AMD64 = 0x8664
+MACHINE_ARM64 = 0xAA64
+
+# IMAGE_SUBSYSTEM_*
+SUBSYSTEM_WINDOWS_GUI = 2
+SUBSYSTEM_WINDOWS_CUI = 3
+
+RT_VERSION = 16
+RESOURCE_DIRECTORY = 2
+
+# Name fragments of helper binaries that ship next to games
+HELPER_NAMES = [
+    'launcher', 'crashhandler', 'crashreport', 'easyanticheat', 'battleye', 'be_service',
+    'anticheat', 'helper', 'service', 'server', 'dedicated', 'benchmark', 'config', 'settings',
+    'editor', 'uploader', 'report', 'overlay', 'cefprocess', 'webhelper', 'vc_redist', 'dxsetup'
+]
+
+# 64-bit shipping binaries usually live here
+PREFERRED_DIRS = ['win64', 'x64', 'binaries', 'bin']
+
+
+def read_pe_header(path):
+    """
+    Return header facts for a PE file as a dict:
+    {"machine", "subsystem", "is_dll", "has_version"}, or None if the file
+    is not a PE image.
+    """
+    try:
+        with open(path, "rb") as f:
+            size = os.fstat(f.fileno()).st_size
+            if size < 0x40:
+                return None
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as view:
+                return _parse_pe(view, size)
+    except (OSError, ValueError, struct.error):
+        return None
+
+
+def _parse_pe(view, size):
+    if view[:2] != b"MZ":
+        return None
+    pe_offset = struct.unpack_from("<I", view, 0x3C)[0]
+    if pe_offset + 24 > size or view[pe_offset:pe_offset + 4] != b"PE\0\0":
+        return None
+
+    machine, section_count, _, _, _, optional_size, characteristics = struct.unpack_from("<HHIIIHH", view, pe_offset + 4)
+    optional = pe_offset + 24
+    if optional_size < 70 or optional + optional_size > size:
+        return None
+    magic = struct.unpack_from("<H", view, optional)[0]
+    subsystem = struct.unpack_from("<H", view, optional + 68)[0]
+
+    # Data directories start after the fixed part of the optional header
+    directories = optional + (112 if magic == 0x20B else 96)
+    has_version = False
+    if directories + 8 * (RESOURCE_DIRECTORY + 1) <= optional + optional_size:
+        resource_rva, resource_size = struct.unpack_from("<II", view, directories + 8 * RESOURCE_DIRECTORY)
+        if resource_rva and resource_size:
+            sections = optional + optional_size
+            offset = _rva_to_offset(view, sections, section_count, resource_rva, size)
+            if offset is not None:
+                has_version = _has_resource_type(view, offset, size, RT_VERSION)
+
+    return {
+        "machine": machine,
+        "subsystem": subsystem,
+        "is_dll": bool(characteristics & 0x2000),
+        "has_version": has_version,
+    }
+
+
+def _rva_to_offset(view, sections, section_count, rva, size):
+    for i in range(min(section_count, 96)):
+        entry = sections + 40 * i
+        if entry + 40 > size:
+            return None
+        virtual_size, virtual_address, raw_size, raw_pointer = struct.unpack_from("<IIII", view, entry + 8)
+        if virtual_address <= rva < virtual_address + max(virtual_size, raw_size):
+            return rva - virtual_address + raw_pointer
+    return None
+
+
+def _has_resource_type(view, offset, size, resource_type):
+    # IMAGE_RESOURCE_DIRECTORY: named entries come first, then id entries
+    if offset + 16 > size:
+        return False
+    named, ids = struct.unpack_from("<HH", view, offset + 12)
+    for i in range(named, named + ids):
+        entry = offset + 16 + 8 * i
+        if entry + 8 > size:
+            return False
+        if struct.unpack_from("<I", view, entry)[0] == resource_type:
+            return True
+    return False
+
+
+class PEHeaderCache:
+    """
+    {path: (size, mtime_ns, header)} persisted as JSON. Thread-safe.
+    hits/misses count lookups since the cache was created.
+    """
+
+    def __init__(self, path=None):
+        self.path = path or os.path.join(default_cache_dir(), "pe_headers.json")
+        self.entries = {}
+        self.hits = 0
+        self.misses = 0
+        self._dirty = False
+        self._lock = threading.Lock()
+        self.entries = load_json_cache(self.path, PE_CACHE_VERSION, "entries") or {}
+
+    def header(self, path, size, mtime_ns):
+        entry = self.entries.get(path)
+        if entry is not None and entry[0] == size and entry[1] == mtime_ns:
+            with self._lock:
+                self.hits += 1
+            return entry[2]
+        header = read_pe_header(path)
+        with self._lock:
+            self.misses += 1
+            self.entries[path] = (size, mtime_ns, header)
+            self._dirty = True
+        return header
+
+    def save(self):
+        with self._lock:
+            if not self._dirty:
+                return
+            save_json_cache(self.path, PE_CACHE_VERSION, "entries", self.entries)
+            self._dirty = False
+
+
+def score_executable(path, size, header, install_location=None, game_name=None):
+    """
+    Higher is more likely to be the game binary. Non-PE files score lowest.
+    """
+    if header is None or header["is_dll"]:
+        return -100.0
+
+    score = 0.0
+    if header["subsystem"] == SUBSYSTEM_WINDOWS_GUI:
+        score += 20
+    elif header["subsystem"] == SUBSYSTEM_WINDOWS_CUI:
+        score -= 15
+    if header["machine"] in (MACHINE_AMD64, MACHINE_ARM64):
+        score += 5
+    if header["has_version"]:
+        score += 5
+
+    # The game binary is usually the biggest executable in the install
+    score += 4 * math.log2(1 + size / (1024 * 1024))
+
+    name = os.path.splitext(os.path.basename(path))[0].lower()
+    if any(helper in name for helper in HELPER_NAMES):
+        score -= 25
+    if game_name:
+        compact_game = "".join(ch for ch in game_name.lower() if ch.isalnum())
+        compact_name = "".join(ch for ch in name if ch.isalnum())
+        if len(compact_name) >= 3 and (compact_name in compact_game or compact_game in compact_name):
+            score += 10
+
+    if install_location:
+        try:
+            relative = os.path.relpath(os.path.dirname(path), install_location)
+        except ValueError:  # different drive
+            relative = "."
+        parts = [] if relative == "." else relative.replace("\\", "/").lower().split("/")
+        score -= 2 * len(parts)
+        if any(part in PREFERRED_DIRS for part in parts):
+            score += 3
+    return score
+
+
+def rank_executables(paths, install_location=None, game_name=None, cache=None, stats=None):
+    """
+    Return paths sorted best first. Files that vanished are dropped.
+    stats, if given, is a dict that receives the number of files statted.
+    """
+    scored = []
+    if stats is not None:
+        stats['files_statted'] = stats.get('files_statted', 0) + len(paths)
+    for order, path in enumerate(paths):
+        try:
+            stat = os.stat(path)
+        except OSError:
+            continue
+        header = cache.header(path, stat.st_size, stat.st_mtime_ns) if cache else read_pe_header(path)
+        score = score_executable(path, stat.st_size, header, install_location, game_name)
+        scored.append((-score, order, path))
+    scored.sort()
+    return [path for _, _, path in scored]
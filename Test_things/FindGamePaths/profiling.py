@@ -0,0 +1,171 @@
+"""
+Scan instrumentation.
+
+A Profiler collects counters and wall times while iter_games runs:
+
+  * counters - registry opens/queries/enumerations, permission errors,
+               directories visited, files statted, executables matched
+  * stages   - seconds spent in registry calls, Steam lookup, merge,
+               classification, location filtering and executable discovery
+  * games    - seconds and counters of the executable search per game
+
+Stage times are summed over all threads, so with several workers they can
+add up to more than the wall time of the scan ("total").
+
+Nothing here is touched unless a profiler is passed in; without one the
+scanner runs its uninstrumented code paths.
+"""
+import json
+import threading
+import time
+
+from registry_source import RegistrySource
+
+SUMMARY_SLOWEST_GAMES = 5
+
+
+class Profiler:
+    """
+    Thread-safe counters and timers for one scan.
+
+    callback(event), if given, is called with a dict for every finished game
+    ({"event": "game", "name", "seconds", "counters"}) and, from finish(),
+    for every stage ({"event": "stage", "stage", "seconds"}).
+    """
+
+    def __init__(self, callback=None):
+        self.callback = callback
+        self.counters = {}
+        self.stages = {}
+        self.games = []
+        self._lock = threading.Lock()
+        self._started = time.perf_counter()
+
+    def count(self, name, n=1):
+        with self._lock:
+            self.counters[name] = self.counters.get(name, 0) + n
+
+    def add_time(self, stage, seconds):
+        with self._lock:
+            self.stages[stage] = self.stages.get(stage, 0.0) + seconds
+
+    def timed(self, stage, fn):
+        """
+        Wrap fn so every call adds its duration to stage.
+        """
+        def wrapper(*args, **kwargs):
+            start = time.perf_counter()
+            try:
+                return fn(*args, **kwargs)
+            finally:
+                self.add_time(stage, time.perf_counter() - start)
+        return wrapper
+
+    def iterate(self, stage, iterable):
+        """
+        Yield from iterable, adding the time spent producing each item to stage.
+        """
+        iterator = iter(iterable)
+        while True:
+            start = time.perf_counter()
+            try:
+                item = next(iterator)
+            except StopIteration:
+                self.add_time(stage, time.perf_counter() - start)
+                return
+            self.add_time(stage, time.perf_counter() - start)
+            yield item
+
+    def game(self, name, seconds, counters):
+        """
+        Record the executable search of one game.
+        """
+        with self._lock:
+            self.games.append((name, seconds, counters))
+            self.stages['executables'] = self.stages.get('executables', 0.0) + seconds
+            for key, value in counters.items():
+                self.counters[key] = self.counters.get(key, 0) + value
+        if self.callback is not None:
+            self.callback({"event": "game", "name": name, "seconds": seconds, "counters": counters})
+
+    def finish(self):
+        """
+        Stop the scan clock and report the stage totals to the callback.
+        """
+        with self._lock:
+            self.stages['total'] = time.perf_counter() - self._started
+            stages = dict(self.stages)
+        if self.callback is not None:
+            for stage, seconds in stages.items():
+                self.callback({"event": "stage", "stage": stage, "seconds": seconds})
+
+    def to_dict(self):
+        with self._lock:
+            return {
+                "counters": dict(self.counters),
+                "stages": dict(self.stages),
+                "games": [{"name": name, "seconds": seconds, "counters": counters}
+                          for name, seconds, counters in self.games],
+            }
+
+    def save(self, path):
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(self.to_dict(), f, indent=2)
+
+    def summary(self):
+        """
+        Human readable report as a list of lines.
+        """
+        data = self.to_dict()
+        lines = ["Stage times (summed over threads):"]
+        for stage, seconds in sorted(data["stages"].items(), key=lambda item: -item[1]):
+            lines.append(f"  {stage:<24} {seconds:>10.3f} s")
+        lines.append("Counters:")
+        for name, value in sorted(data["counters"].items()):
+            lines.append(f"  {name:<24} {value:>10}")
+        slowest = sorted(data["games"], key=lambda game: -game["seconds"])[:SUMMARY_SLOWEST_GAMES]
+        if slowest:
+            lines.append("Slowest executable searches:")
+            for game in slowest:
+                lines.append(f"  {game['seconds']:>8.3f} s  {game['name']}")
+        return lines
+
+
+class ProfiledSource(RegistrySource):
+    """
+    RegistrySource wrapper that counts key opens, value queries, subkey
+    enumerations and permission errors, and times every call as the
+    "registry" stage.
+    """
+
+    def __init__(self, source, profiler):
+        self.source = source
+        self.profiler = profiler
+
+    def _call(self, counter, fn, *args):
+        profiler = self.profiler
+        start = time.perf_counter()
+        try:
+            return fn(*args)
+        except PermissionError:
+            profiler.count('permission_errors')
+            raise
+        finally:
+            profiler.add_time('registry', time.perf_counter() - start)
+            profiler.count('registry_opens')
+            profiler.count(counter)
+
+    def enum_subkeys(self, hive, path):
+        return self._call('registry_enums', self.source.enum_subkeys, hive, path)
+
+    def query_values(self, hive, path, names=None):
+        return self._call('registry_queries', self.source.query_values, hive, path, names)
+
+    def last_write(self, hive, path):
+        return self._call('registry_queries', self.source.last_write, hive, path)
+
+    def enum_subkeys_with_timestamps(self, hive, path):
+        entries = self._call('registry_enums', self.source.enum_subkeys_with_timestamps, hive, path)
+        # One more open per subkey to read its timestamp
+        self.profiler.count('registry_opens', len(entries))
+        return entries
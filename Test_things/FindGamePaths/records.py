@@ -0,0 +1,220 @@
+"""
+Compact program records.
+
+Program is a __slots__ record that still answers program['name'] style
+lookups, so code written against the old per-program dicts keeps working.
+ProgramTable stores many programs column by column with interned publisher
+and directory strings, and filters through index views instead of copies.
+"""
+import re
+from array import array
+
+FIELDS = ('name', 'install_location', 'publisher', 'app_id', 'executables', 'source', 'source_key')
+
+
+class Program:
+    """
+    One installed program. Supports the read side of the dict interface
+    (program['name'], program.get('app_id'), 'publisher' in program, dict(program)).
+    """
+    __slots__ = FIELDS
+
+    def __init__(self, name, install_location=None, publisher=None, app_id=None, executables=None, source=None,
+                 source_key=None):
+        self.name = name
+        self.install_location = install_location
+        self.publisher = publisher
+        self.app_id = app_id
+        self.executables = executables
+        # Where the record came from, e.g. "hklm" or "steam" (see merge.py)
+        self.source = source
+        # Identity within that source: the full registry key path, or "steam:<app id>"
+        self.source_key = source_key
+
+    def __getitem__(self, key):
+        if key not in FIELDS:
+            raise KeyError(key)
+        return getattr(self, key)
+
+    def __setitem__(self, key, value):
+        if key not in FIELDS:
+            raise KeyError(key)
+        setattr(self, key, value)
+
+    def get(self, key, default=None):
+        return getattr(self, key, default) if key in FIELDS else default
+
+    def __contains__(self, key):
+        return key in FIELDS
+
+    def keys(self):
+        return FIELDS
+
+    def to_dict(self):
+        return {field: getattr(self, field) for field in FIELDS}
+
+    @classmethod
+    def from_dict(cls, data):
+        return cls(**{field: data.get(field) for field in FIELDS})
+
+    def __eq__(self, other):
+        if isinstance(other, Program):
+            return all(getattr(self, f) == getattr(other, f) for f in FIELDS)
+        return NotImplemented
+
+    def __repr__(self):
+        return f"Program({', '.join(f'{f}={getattr(self, f)!r}' for f in FIELDS)})"
+
+
+_SPLIT_DIR = re.compile(r"^(.*[\\/])([^\\/]*)$")
+
+
+class ProgramTable:
+    """
+    Column store of programs.
+
+    Publishers and install directory prefixes are interned through a shared
+    pool, so thousands of programs under "D:\\Games\\" or published by
+    "Ubisoft" hold one copy of those strings. Rows are read through
+    lightweight ProgramRow accessors; filter() returns a TableView of row
+    indices.
+    """
+
+    def __init__(self, programs=()):
+        self._pool = {}
+        self._names = []
+        self._location_dirs = []
+        self._location_leaves = []
+        self._publishers = []
+        self._app_ids = []
+        self._executables = []
+        self._sources = []
+        self._source_keys = []
+        self.extend(programs)
+
+    def _intern(self, value):
+        if value is None:
+            return None
+        return self._pool.setdefault(value, value)
+
+    def append(self, program):
+        location = program['install_location']
+        if location:
+            match = _SPLIT_DIR.match(location)
+            location_dir, leaf = (self._intern(match.group(1)), match.group(2)) if match else (None, location)
+        else:
+            location_dir, leaf = None, location
+        self._names.append(program['name'])
+        self._location_dirs.append(location_dir)
+        self._location_leaves.append(leaf)
+        self._publishers.append(self._intern(program['publisher']))
+        self._app_ids.append(program.get('app_id'))
+        self._executables.append(program.get('executables'))
+        self._sources.append(self._intern(program.get('source')))
+        self._source_keys.append(program.get('source_key'))
+
+    def extend(self, programs):
+        for program in programs:
+            self.append(program)
+
+    def __len__(self):
+        return len(self._names)
+
+    def __getitem__(self, index):
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError(index)
+        return ProgramRow(self, index)
+
+    def __iter__(self):
+        return (ProgramRow(self, i) for i in range(len(self)))
+
+    def value(self, index, field):
+        if field == 'name':
+            return self._names[index]
+        if field == 'install_location':
+            location_dir = self._location_dirs[index]
+            leaf = self._location_leaves[index]
+            return location_dir + leaf if location_dir is not None else leaf
+        if field == 'publisher':
+            return self._publishers[index]
+        if field == 'app_id':
+            return self._app_ids[index]
+        if field == 'executables':
+            return self._executables[index]
+        if field == 'source':
+            return self._sources[index]
+        if field == 'source_key':
+            return self._source_keys[index]
+        raise KeyError(field)
+
+    def set_value(self, index, field, value):
+        if field == 'executables':
+            self._executables[index] = value
+        elif field == 'app_id':
+            self._app_ids[index] = value
+        else:
+            raise KeyError(f"{field} is read-only in a ProgramTable")
+
+    def filter(self, predicate):
+        return TableView(self, range(len(self))).filter(predicate)
+
+    def view(self, indices):
+        return TableView(self, indices)
+
+
+class TableView:
+    """
+    Ordered subset of a ProgramTable, held as an array of row indices.
+    """
+
+    def __init__(self, table, indices):
+        self.table = table
+        self.indices = array('I', indices)
+
+    def __len__(self):
+        return len(self.indices)
+
+    def __getitem__(self, index):
+        return ProgramRow(self.table, self.indices[index])
+
+    def __iter__(self):
+        table = self.table
+        return (ProgramRow(table, i) for i in self.indices)
+
+    def filter(self, predicate):
+        table = self.table
+        return TableView(table, (i for i in self.indices if predicate(ProgramRow(table, i))))
+
+
+class ProgramRow:
+    """
+    Dict-compatible accessor for one row of a ProgramTable.
+    """
+    __slots__ = ('table', 'index')
+
+    def __init__(self, table, index):
+        self.table = table
+        self.index = index
+
+    def __getitem__(self, key):
+        return self.table.value(self.index, key)
+
+    def __setitem__(self, key, value):
+        self.table.set_value(self.index, key, value)
+
+    def get(self, key, default=None):
+        return self.table.value(self.index, key) if key in FIELDS else default
+
+    def __contains__(self, key):
+        return key in FIELDS
+
+    def keys(self):
+        return FIELDS
+
+    def to_program(self):
+        return Program(*(self.table.value(self.index, field) for field in FIELDS))
+
+    def __repr__(self):
+        return f"ProgramRow({self.index}, {self['name']!r})"
@@ -0,0 +1,221 @@
+"""
+Registry backends for the game scanner.
+
+The scanner never talks to winreg directly. It goes through a RegistrySource,
+which is either the live Windows registry (WinregSource) or a JSON/pickle
+snapshot of the keys we care about (SnapshotSource). Snapshots let the
+scanner run, and be benchmarked, on machines without a Windows registry.
+"""
+import json
+import os
+import pickle
+
+try:
+    import winreg
+except ImportError:  # not on Windows
+    winreg = None
+
+HKLM = "HKEY_LOCAL_MACHINE"
+HKCU = "HKEY_CURRENT_USER"
+
+
+class RegistrySource:
+    """
+    Read-only view of a registry. Keys are addressed as (hive, path) where
+    hive is HKLM/HKCU and path is a backslash separated subkey path.
+    Methods raise OSError when a key does not exist or cannot be opened.
+    """
+
+    def enum_subkeys(self, hive, path):
+        """
+        Return the names of the direct subkeys of a key, in registry order.
+        """
+        raise NotImplementedError
+
+    def query_values(self, hive, path, names=None):
+        """
+        Return a dict of the requested values of a key. Values that do not
+        exist are left out. With names=None every value is returned.
+        """
+        raise NotImplementedError
+
+    def last_write(self, hive, path):
+        """
+        Return the last-write timestamp of a key, or None if the backend
+        does not know it. Values are only comparable within one backend.
+        """
+        raise NotImplementedError
+
+    def enum_subkeys_with_timestamps(self, hive, path):
+        """
+        Return [(name, last_write)] for the direct subkeys of a key.
+        """
+        entries = []
+        for name in self.enum_subkeys(hive, path):
+            try:
+                entries.append((name, self.last_write(hive, path + "\\" + name)))
+            except OSError:
+                continue
+        return entries
+
+
+class WinregSource(RegistrySource):
+    """
+    Live Windows registry. Every call opens its own key handle, so one
+    instance can be shared between threads.
+    """
+
+    def __init__(self):
+        if winreg is None:
+            raise RuntimeError("winreg is not available on this platform, use a registry snapshot")
+        self._hives = {
+            HKLM: winreg.HKEY_LOCAL_MACHINE,
+            HKCU: winreg.HKEY_CURRENT_USER,
+        }
+
+    def enum_subkeys(self, hive, path):
+        names = []
+        with winreg.OpenKey(self._hives[hive], path) as key:
+            for i in range(winreg.QueryInfoKey(key)[0]):  # Number of subkeys
+                try:
+                    names.append(winreg.EnumKey(key, i))
+                except OSError:
+                    continue
+        return names
+
+    def query_values(self, hive, path, names=None):
+        values = {}
+        with winreg.OpenKey(self._hives[hive], path) as key:
+            if names is None:
+                for i in range(winreg.QueryInfoKey(key)[1]):  # Number of values
+                    name, value, _ = winreg.EnumValue(key, i)
+                    values[name] = value
+                return values
+            for name in names:
+                try:
+                    values[name], _ = winreg.QueryValueEx(key, name)
+                except FileNotFoundError:
+                    pass
+        return values
+
+    def last_write(self, hive, path):
+        with winreg.OpenKey(self._hives[hive], path) as key:
+            return winreg.QueryInfoKey(key)[2]  # 100ns intervals since 1601
+
+    def enum_subkeys_with_timestamps(self, hive, path):
+        # Open each subkey relative to the parent handle instead of from the hive root
+        entries = []
+        with winreg.OpenKey(self._hives[hive], path) as key:
+            for i in range(winreg.QueryInfoKey(key)[0]):
+                try:
+                    name = winreg.EnumKey(key, i)
+                    with winreg.OpenKey(key, name) as subkey:
+                        entries.append((name, winreg.QueryInfoKey(subkey)[2]))
+                except OSError:
+                    continue
+        return entries
+
+
+class SnapshotSource(RegistrySource):
+    """
+    Registry snapshot held in memory. The data is a nested dict:
+
+        {hive: {"values": {...}, "timestamp": int, "subkeys": {name: {...}}}}
+
+    "timestamp" is optional; keys without one report None from last_write.
+
+    Key lookups are case-insensitive like the real registry.
+    """
+
+    def __init__(self, data):
+        self.data = data
+
+    @classmethod
+    def load(cls, path):
+        """
+        Load a snapshot written by save_snapshot (.json, anything else is pickle).
+        """
+        if str(path).lower().endswith(".json"):
+            with open(path, "r", encoding="utf-8") as f:
+                return cls(json.load(f))
+        with open(path, "rb") as f:
+            return cls(pickle.load(f))
+
+    def _node(self, hive, path):
+        node = self.data.get(hive)
+        if node is None:
+            raise FileNotFoundError(f"{hive}\\{path}")
+        for part in filter(None, path.split("\\")):
+            subkeys = node.get("subkeys", {})
+            child = subkeys.get(part)
+            if child is None:
+                folded = part.casefold()
+                child = next((v for k, v in subkeys.items() if k.casefold() == folded), None)
+            if child is None:
+                raise FileNotFoundError(f"{hive}\\{path}")
+            node = child
+        return node
+
+    def enum_subkeys(self, hive, path):
+        return list(self._node(hive, path).get("subkeys", {}))
+
+    def query_values(self, hive, path, names=None):
+        values = self._node(hive, path).get("values", {})
+        if names is None:
+            return dict(values)
+        return {name: values[name] for name in names if name in values}
+
+    def last_write(self, hive, path):
+        return self._node(hive, path).get("timestamp")
+
+    def enum_subkeys_with_timestamps(self, hive, path):
+        return [(name, node.get("timestamp")) for name, node in self._node(hive, path).get("subkeys", {}).items()]
+
+
+def default_source():
+    """
+    Return the live registry on Windows. Elsewhere a snapshot must be given.
+    """
+    return WinregSource()
+
+
+def capture_snapshot(source, roots):
+    """
+    Copy the given (hive, path) keys, their values and one level of subkeys
+    (with values and timestamps) out of a source into snapshot form.
+    Missing roots are skipped.
+    """
+    data = {}
+    for hive, path in roots:
+        try:
+            subkeys = source.enum_subkeys_with_timestamps(hive, path)
+            root_values = source.query_values(hive, path)
+        except OSError:
+            continue
+        node = data.setdefault(hive, {"values": {}, "subkeys": {}})
+        for part in filter(None, path.split("\\")):
+            node = node["subkeys"].setdefault(part, {"values": {}, "subkeys": {}})
+        node["values"].update(root_values)
+        for name, timestamp in subkeys:
+            try:
+                values = source.query_values(hive, path + "\\" + name)
+            except OSError:
+                continue
+            child = node["subkeys"].setdefault(name, {"values": {}, "subkeys": {}})
+            child["values"].update(values)
+            if timestamp is not None:
+                child["timestamp"] = timestamp
+    return data
+
+
+def save_snapshot(data, path):
+    """
+    Write snapshot data to disk, as JSON if the file name ends in .json.
+    """
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    if str(path).lower().endswith(".json"):
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(data, f, default=str)
+    else:
+        with open(path, "wb") as f:
+            pickle.dump(data, f, protocol=pickle.HIGHEST_PROTOCOL)
@@ -0,0 +1,110 @@
+"""
+Persistent cache of extracted Uninstall entries.
+
+Each registry subkey is stored with its last-write timestamp and the program
+info extracted from it. A later scan only rereads subkeys whose timestamp
+changed or that are new; entries for subkeys that disappeared are dropped.
+"""
+import json
+import os
+
+CACHE_VERSION = 1
+
+
+def default_cache_dir():
+    """
+    Per-user cache directory for the game scanner.
+    """
+    base = os.environ.get("LOCALAPPDATA") or os.environ.get("XDG_CACHE_HOME") or os.path.join(os.path.expanduser("~"), ".cache")
+    return os.path.join(base, "FindGamesInstalled")
+
+
+def load_json_cache(path, version, field):
+    """
+    Return the field stored by save_json_cache in path, or None if the file
+    is missing, unreadable or was written with another version.
+    """
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            data = json.load(f)
+    except (OSError, ValueError):
+        return None
+    if not isinstance(data, dict) or data.get("version") != version:
+        return None
+    return data.get(field)
+
+
+def save_json_cache(path, version, field, value):
+    """
+    Write {"version": version, field: value} to path, creating its directory.
+    The file is written under a temporary name and renamed into place, so a
+    crash never leaves a truncated cache behind. Raises OSError.
+    """
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    tmp_path = path + ".tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump({"version": version, field: value}, f)
+    os.replace(tmp_path, path)
+
+
+class ScanCache:
+    """
+    {key: (timestamp, program_info)} backed by a JSON file.
+
+    Keys are full registry paths ("HIVE\\path\\subkey"). program_info may be
+    None for subkeys that are not programs, so those are not reopened either.
+    hits/misses/removed count lookups since the cache was loaded.
+    """
+
+    def __init__(self, path=None, rebuild=False):
+        self.path = path or os.path.join(default_cache_dir(), "scan_cache.json")
+        self.entries = {}
+        self.hits = 0
+        self.misses = 0
+        self.removed = 0
+        self._dirty = False
+        if not rebuild:
+            self._load()
+        else:
+            self._dirty = True
+
+    def _load(self):
+        self.entries = load_json_cache(self.path, CACHE_VERSION, "entries") or {}
+
+    def lookup(self, key, timestamp):
+        """
+        Return (True, program_info) if key is cached with this timestamp,
+        else (False, None). Keys without a timestamp are never cached.
+        """
+        entry = self.entries.get(key)
+        if timestamp is not None and entry is not None and entry[0] == timestamp:
+            self.hits += 1
+            return True, entry[1]
+        self.misses += 1
+        return False, None
+
+    def store(self, key, timestamp, program_info):
+        if timestamp is None:
+            return
+        self.entries[key] = (timestamp, program_info)
+        self._dirty = True
+
+    def retain(self, keys):
+        """
+        Drop every entry whose key is not in keys (deleted subkeys).
+        """
+        stale = [key for key in self.entries if key not in keys]
+        for key in stale:
+            del self.entries[key]
+        if stale:
+            self.removed += len(stale)
+            self._dirty = True
+
+    def save(self):
+        if not self._dirty:
+            return
+        save_json_cache(self.path, CACHE_VERSION, "entries", self.entries)
+        self._dirty = False
+
+    def stats(self):
+        return {"hits": self.hits, "misses": self.misses, "removed": self.removed}
@@ -0,0 +1,189 @@
+"""
+Steam library reader.
+
+Parses libraryfolders.vdf and every steamapps/appmanifest_*.acf to map each
+installed app id to its exact install directory, including games in
+secondary libraries. An app counts as installed while its manifest is not
+marked uninstalled and its install directory exists, so games in the
+middle of an update are kept. Parsed manifests are cached on disk keyed
+on their mtimes, so only manifests that changed are reparsed.
+"""
+import os
+import re
+
+from scan_cache import default_cache_dir, load_json_cache, save_json_cache
+
+INDEX_CACHE_VERSION = 2
+
+# StateFlags bit of a manifest whose app has been removed. Updating apps
+# (e.g. 1026, UpdateRequired | UpdateStarted) clear FullyInstalled while
+# their files are still on disk, so that bit is not required.
+STATE_UNINSTALLED = 1
+
+_TOKEN = re.compile(r'"((?:[^"\\]|\\.)*)"|(\{)|(\})|//[^\n]*|([^\s{}"]+)')
+_ESCAPES = {"n": "\n", "t": "\t", "\\": "\\", '"': '"'}
+_ESCAPE = re.compile(r'\\(.)')
+
+
+def _unescape(value):
+    if "\\" not in value:
+        return value
+    return _ESCAPE.sub(lambda m: _ESCAPES.get(m.group(1), m.group(0)), value)
+
+
+def parse_vdf(text):
+    """
+    Parse Valve KeyValues text (VDF/ACF) into nested dicts.
+    Duplicate keys keep the last value.
+    """
+    root = {}
+    stack = [root]
+    key = None
+    for match in _TOKEN.finditer(text):
+        quoted, open_brace, close_brace, bare = match.groups()
+        if open_brace:
+            if key is None:
+                raise ValueError(f"unexpected '{{' at offset {match.start()}")
+            child = {}
+            stack[-1][key] = child
+            stack.append(child)
+            key = None
+        elif close_brace:
+            if len(stack) == 1:
+                raise ValueError(f"unexpected '}}' at offset {match.start()}")
+            stack.pop()
+            key = None
+        elif quoted is not None or bare is not None:
+            token = _unescape(quoted) if quoted is not None else bare
+            if key is None:
+                key = token
+            else:
+                stack[-1][key] = token
+                key = None
+        # comments fall through
+    return root
+
+
+def load_vdf(path):
+    with open(path, "r", encoding="utf-8", errors="replace") as f:
+        return parse_vdf(f.read())
+
+
+def _get(mapping, key):
+    # VDF keys are case-insensitive in practice ("LibraryFolders" vs "libraryfolders")
+    if key in mapping:
+        return mapping[key]
+    folded = key.lower()
+    for k, v in mapping.items():
+        if k.lower() == folded:
+            return v
+    return None
+
+
+def library_folders(steam_root):
+    """
+    Return the Steam library folders, the Steam root first.
+    Understands both the current and the pre-2021 libraryfolders.vdf layout.
+    """
+    folders = [steam_root]
+    try:
+        data = load_vdf(os.path.join(steam_root, "steamapps", "libraryfolders.vdf"))
+    except (OSError, ValueError):
+        return folders
+
+    entries = _get(data, "libraryfolders") or {}
+    for key, value in entries.items():
+        if not key.isdigit():
+            continue
+        path = _get(value, "path") if isinstance(value, dict) else value
+        if path and os.path.normcase(os.path.normpath(path)) not in (
+                os.path.normcase(os.path.normpath(folder)) for folder in folders):
+            folders.append(path)
+    return folders
+
+
+def read_app_manifest(path, library):
+    """
+    Parse one appmanifest_*.acf. Returns an index entry, or None if the app
+    is marked uninstalled or the manifest is unusable.
+    """
+    try:
+        state = _get(load_vdf(path), "AppState")
+    except (OSError, ValueError):
+        return None
+    if not isinstance(state, dict):
+        return None
+
+    app_id = _get(state, "appid")
+    install_dir = _get(state, "installdir")
+    if not app_id or not install_dir:
+        return None
+    try:
+        flags = int(_get(state, "StateFlags") or 0)
+    except ValueError:
+        flags = 0
+    if flags & STATE_UNINSTALLED:
+        return None
+
+    return {
+        'app_id': app_id,
+        'name': _get(state, "name") or install_dir,
+        'install_dir': os.path.join(library, "steamapps", "common", install_dir),
+        'library': library
+    }
+
+
+def manifest_files(library):
+    """
+    Yield (path, mtime_ns) for every appmanifest_*.acf in a library.
+    """
+    steamapps = os.path.join(library, "steamapps")
+    try:
+        with os.scandir(steamapps) as it:
+            for entry in it:
+                name = entry.name.lower()
+                if name.startswith("appmanifest_") and name.endswith(".acf"):
+                    try:
+                        yield entry.path, entry.stat().st_mtime_ns
+                    except OSError:
+                        continue
+    except OSError:
+        return
+
+
+def build_app_index(steam_root, cache_path=None):
+    """
+    Return {app_id: entry} for every installed app in every library whose
+    install directory exists.
+
+    With cache_path, parsed manifests are stored with their mtime and reused
+    while the manifest file is unchanged. Pass cache_path=False to disable.
+    """
+    if cache_path is None:
+        cache_path = os.path.join(default_cache_dir(), "steam_index.json")
+
+    cached = {}
+    if cache_path:
+        cached = load_json_cache(cache_path, INDEX_CACHE_VERSION, "manifests") or {}
+
+    manifests = {}
+    index = {}
+    for library in library_folders(steam_root):
+        for path, mtime in manifest_files(library):
+            hit = cached.get(path)
+            if hit is not None and hit[0] == mtime:
+                entry = hit[1]
+            else:
+                entry = read_app_manifest(path, library)
+            manifests[path] = (mtime, entry)
+            # Checked on every build: the directory can go away without the manifest changing
+            if entry is not None and entry['app_id'] not in index and os.path.isdir(entry['install_dir']):
+                index[entry['app_id']] = entry
+
+    if cache_path and manifests != {path: tuple(value) for path, value in cached.items()}:
+        try:
+            save_json_cache(cache_path, INDEX_CACHE_VERSION, "manifests", manifests)
+        except OSError:
+            pass
+
+    return index
@@ -0,0 +1,31 @@
+"""
+Helpers for running generator pipeline stages on a thread pool.
+"""
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+
+
+def ordered_imap(fn, iterable, workers, window=None):
+    """
+    Lazy, order-preserving parallel map.
+
+    At most window calls are in flight, so the input is consumed only as
+    fast as results are taken and memory does not grow with its length.
+    Results are yielded as soon as they and all earlier ones are done, so
+    a slow input does not hold back work that already finished.
+    Closing the generator early cancels work that has not started yet.
+    """
+    window = window or workers * 2
+    pool = ThreadPoolExecutor(max_workers=workers)
+    pending = deque()
+    try:
+        for item in iterable:
+            pending.append(pool.submit(fn, item))
+            if len(pending) >= window:
+                yield pending.popleft().result()
+            while pending and pending[0].done():
+                yield pending.popleft().result()
+        while pending:
+            yield pending.popleft().result()
+    finally:
+        pool.shutdown(wait=False, cancel_futures=True)
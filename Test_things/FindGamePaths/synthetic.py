@@ -0,0 +1,211 @@
+"""
+Synthetic data for benchmarking the scanner without a Windows machine.
+
+  * synthetic_programs      - program dicts with a realistic name/publisher mix
+  * synthetic_registry      - a registry snapshot (SnapshotSource data) with
+                              Uninstall entries in all three hives and a
+                              Steam Apps key
+  * synthetic_install_tree  - game directories on disk with deep asset
+                              folders, redistributables and many executables,
+                              written as minimal PE images so ranking sees
+                              real header facts
+
+Everything is seeded, so the same arguments always produce the same data.
+"""
+import ntpath
+import os
+import random
+import struct
+
+from classifier import GAME_KEYWORDS, GAME_PUBLISHERS, NON_GAME_KEYWORDS
+from FindGamesInstalled import STEAM_APPS_PATH, STEAM_PATH, UNINSTALL_PATHS
+from pe_rank import MACHINE_AMD64, MACHINE_I386, RT_VERSION, SUBSYSTEM_WINDOWS_CUI, SUBSYSTEM_WINDOWS_GUI
+from registry_source import HKLM
+
+FILLER_WORDS = [
+    'alpha', 'nova', 'dark', 'legend', 'chronicles', 'studio', 'pro', 'player',
+    'manager', 'helper', 'service', 'sdk', 'x64', '2019', 'remastered', 'classic'
+]
+LIBRARY_DIRS = ['Games', 'SteamLibrary\\steamapps\\common', 'Program Files', 'Program Files (x86)\\Ubisoft']
+OTHER_PUBLISHERS = ['Realtek', 'Intel Corporation', 'NVIDIA Corporation', 'Google LLC', 'Mozilla', 'Oracle', None]
+
+# (publisher, weight): most uninstall entries on a real machine are runtimes and drivers
+PUBLISHER_WEIGHTS = [
+    ('Microsoft Corporation', 30), ('Intel Corporation', 6), ('NVIDIA Corporation', 6),
+    ('Advanced Micro Devices, Inc.', 3), ('Realtek Semiconductor Corp.', 3), ('Google LLC', 2),
+    ('Adobe Inc.', 2), ('Valve', 4), ('Ubisoft', 3), ('Electronic Arts', 3), ('Epic Games, Inc.', 2),
+    ('Bethesda Softworks', 1), ('CD PROJEKT RED', 1), ('Square Enix', 1), ('Capcom', 1),
+    ('SEGA', 1), ('Indie Studio', 4), (None, 8),
+]
+NON_GAME_TEMPLATES = [
+    'Microsoft Visual C++ {year} Redistributable (x64) - 14.{n}',
+    'Microsoft .NET Runtime - {n}.0.{m} (x64)', 'NVIDIA Graphics Driver {n}.{m}',
+    'Intel(R) Management Engine Components', 'Realtek High Definition Audio Driver',
+    'Google Chrome', 'Adobe Acrobat Reader', 'Windows SDK AddOn', 'Update for Windows (KB{n}{m})',
+]
+GAME_ADJECTIVES = ['Dark', 'Eternal', 'Lost', 'Iron', 'Crimson', 'Silent', 'Final', 'Hollow', 'Star', 'Frozen']
+GAME_NOUNS = ['Kingdom', 'Frontier', 'Legacy', 'Horizon', 'Citadel', 'Odyssey', 'Protocol', 'Dynasty', 'Raiders']
+GAME_SUFFIXES = ['', '', ' II', ' III', ': Remastered', ' - Definitive Edition', ' Online', ' Simulator']
+
+
+def synthetic_programs(count, seed=0):
+    """
+    Random program records with names and publishers drawn from the
+    classifier keyword lists mixed with filler words.
+    """
+    rng = random.Random(seed)
+    words = GAME_KEYWORDS + NON_GAME_KEYWORDS + FILLER_WORDS * 3
+    publishers = [p.title() for p in GAME_PUBLISHERS] + OTHER_PUBLISHERS * 4
+    programs = []
+    for i in range(count):
+        name = " ".join(rng.choice(words).title() for _ in range(rng.randint(1, 4)))
+        # Copy the publisher like a registry read would, so records do not share one constant
+        publisher = rng.choice(publishers)
+        programs.append({
+            'name': f"{name} {i}",
+            'install_location': f"{rng.choice('CDE')}:\\{rng.choice(LIBRARY_DIRS)}\\{name} {i}",
+            'publisher': "".join(publisher) if publisher else None
+        })
+    return programs
+
+
+def _program_values(rng, i, install_locations):
+    publishers, weights = zip(*PUBLISHER_WEIGHTS)
+    publisher = rng.choices(publishers, weights)[0]
+    is_game_publisher = publisher in ('Valve', 'Ubisoft', 'Electronic Arts', 'Epic Games, Inc.', 'Bethesda Softworks',
+                                      'CD PROJEKT RED', 'Square Enix', 'Capcom', 'SEGA', 'Indie Studio')
+    if is_game_publisher:
+        name = f"{rng.choice(GAME_ADJECTIVES)} {rng.choice(GAME_NOUNS)}{rng.choice(GAME_SUFFIXES)} {i}"
+        if install_locations:
+            location = install_locations[i % len(install_locations)]
+        else:
+            location = f"{rng.choice('CDDDE')}:\\{rng.choice(LIBRARY_DIRS)}\\{name}"
+    else:
+        name = rng.choice(NON_GAME_TEMPLATES).format(year=rng.choice([2010, 2013, 2015, 2022]),
+                                                     n=rng.randint(1, 600), m=rng.randint(0, 99))
+        location = f"C:\\Program Files\\{(publisher or 'Vendor').split()[0]}\\{name}"
+
+    values = {"DisplayName": name, "Publisher": publisher}
+    if publisher is None:
+        del values["Publisher"]
+    roll = rng.random()
+    if roll < 0.7:
+        values["InstallLocation"] = location
+    elif roll < 0.9:
+        # Given install locations are native paths, generated ones are Windows paths
+        join = os.path.join if install_locations else ntpath.join
+        values["UninstallString"] = f'"{join(location, "unins000.exe")}"'
+    if rng.random() < 0.03:
+        del values["DisplayName"]  # update/patch entries without a name
+    return values
+
+
+def synthetic_registry(count, steam_apps=0, duplicate_ratio=0.1, seed=0, install_locations=None):
+    """
+    Snapshot data with count Uninstall entries spread over the three hives.
+
+    duplicate_ratio of the HKLM entries are repeated under WOW6432Node, like
+    installers that register in both views. With steam_apps > 0 a Steam key
+    with that many apps (80% installed) is added. install_locations, if
+    given, are used as the install directory of the game entries.
+    """
+    rng = random.Random(seed)
+    data = {}
+
+    def node(hive, path):
+        current = data.setdefault(hive, {"values": {}, "subkeys": {}})
+        for part in path.split("\\"):
+            current = current["subkeys"].setdefault(part, {"values": {}, "subkeys": {}})
+        return current
+
+    hive_nodes = [node(hive, path) for hive, path in UNINSTALL_PATHS]
+    for i in range(count):
+        target = rng.choices(hive_nodes, weights=(60, 30, 10))[0]
+        entry = {"values": _program_values(rng, i, install_locations), "subkeys": {}, "timestamp": 132000000000000000 + i}
+        subkey = f"{{{rng.getrandbits(128):032X}}}" if rng.random() < 0.6 else f"Program{i}"
+        target["subkeys"][subkey] = entry
+        if target is hive_nodes[0] and rng.random() < duplicate_ratio:
+            hive_nodes[1]["subkeys"][subkey] = dict(entry)
+
+    if steam_apps:
+        node(HKLM, STEAM_PATH)["values"]["InstallPath"] = "C:\\Program Files (x86)\\Steam"
+        apps = node(HKLM, STEAM_APPS_PATH)
+        for i in range(steam_apps):
+            app_id = str(10 + i * 10)
+            apps["subkeys"][app_id] = {
+                "values": {"Name": f"{rng.choice(GAME_ADJECTIVES)} {rng.choice(GAME_NOUNS)} {app_id}",
+                           "Installed": 1 if rng.random() < 0.8 else 0},
+                "subkeys": {},
+            }
+    return data
+
+
+def synthetic_install_tree(root, games, asset_depth=6, asset_dirs=4, exes_per_game=6, seed=0):
+    """
+    Create games install directories under root and return their paths.
+
+    Each game gets a main executable in Binaries/Win64, a launcher and
+    helper executables near the top, a redistributable folder full of
+    installers and an Engine/Content asset tree asset_depth levels deep
+    whose leaves also contain stray executables.
+    """
+    rng = random.Random(seed)
+    locations = []
+    for g in range(games):
+        location = os.path.join(root, f"Game{g:05d}")
+        locations.append(location)
+        win64 = os.path.join(location, "Binaries", "Win64")
+        os.makedirs(win64, exist_ok=True)
+        write_pe(os.path.join(win64, f"Game{g:05d}-Win64-Shipping.exe"), 64 * 1024, version=True)
+        write_pe(os.path.join(location, "Launcher.exe"), 4 * 1024, machine=MACHINE_I386, version=True)
+        write_pe(os.path.join(location, "unins000.exe"), 4 * 1024, machine=MACHINE_I386)
+        for h in range(max(0, exes_per_game - 3)):
+            write_pe(os.path.join(location, f"Tool{h}.exe"), 8 * 1024, subsystem=SUBSYSTEM_WINDOWS_CUI)
+
+        redist = os.path.join(location, "_CommonRedist", "vcredist", "2019")
+        os.makedirs(redist, exist_ok=True)
+        write_pe(os.path.join(redist, "VC_redist.x64.exe"), 4 * 1024, version=True)
+
+        frontier = [os.path.join(location, "Engine", "Content")]
+        for depth in range(asset_depth):
+            next_frontier = []
+            for directory in frontier:
+                for a in range(asset_dirs if depth < 2 else 1):
+                    child = os.path.join(directory, f"Assets{depth}_{a}")
+                    os.makedirs(child, exist_ok=True)
+                    next_frontier.append(child)
+            frontier = next_frontier
+        for leaf in frontier[:8]:
+            write_pe(os.path.join(leaf, f"Stray{rng.randint(0, 999)}.exe"), 4 * 1024, subsystem=SUBSYSTEM_WINDOWS_CUI)
+    return locations
+
+
+def write_pe(path, size, machine=MACHINE_AMD64, subsystem=SUBSYSTEM_WINDOWS_GUI, version=False):
+    """
+    Write a minimal PE32+ image of size bytes (at least 4 KiB) with the
+    header facts pe_rank reads: machine, subsystem and, with version=True,
+    a resource directory holding an RT_VERSION entry.
+    """
+    image = bytearray(max(size, 0x1000))
+    pe_offset = 0x40
+    optional_size = 240  # PE32+ fixed part plus 16 data directories
+    optional = pe_offset + 24
+    sections = optional + optional_size
+    resource_rva, resource_raw = 0x1000, 0x400
+
+    image[:2] = b"MZ"
+    struct.pack_into("<I", image, 0x3C, pe_offset)
+    image[pe_offset:pe_offset + 4] = b"PE\0\0"
+    struct.pack_into("<HHIIIHH", image, pe_offset + 4, machine, 1, 0, 0, 0, optional_size, 0x0022)
+    struct.pack_into("<H", image, optional, 0x20B)
+    struct.pack_into("<H", image, optional + 68, subsystem)
+    if version:
+        struct.pack_into("<II", image, optional + 112 + 8 * 2, resource_rva, 0x100)
+        # IMAGE_RESOURCE_DIRECTORY with one id entry
+        struct.pack_into("<HH", image, resource_raw + 12, 0, 1)
+        struct.pack_into("<II", image, resource_raw + 16, RT_VERSION, 0x80000018)
+    image[sections:sections + 8] = b".rsrc\0\0\0"
+    struct.pack_into("<IIII", image, sections + 8, 0x200, resource_rva, 0x200, resource_raw)
+
+    with open(path, "wb") as f:
+        f.write(image)
@@ -0,0 +1,114 @@
+"""
+Stop, thread budget and streaming of async_scan.iter_games.
+
+    python -m unittest test_async_scan
+"""
+import asyncio
+import os
+import tempfile
+import threading
+import time
+import unittest
+from unittest import mock
+
+import async_scan
+from records import Program
+from registry_source import SnapshotSource
+from synthetic import synthetic_registry
+
+
+class StopTest(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        locations = []
+        for i in range(20):
+            locations.append(os.path.join(self.tmp.name, f"Game{i}"))
+            os.mkdir(locations[-1])
+        self.source = SnapshotSource(synthetic_registry(200, install_locations=locations))
+        self.started = []
+        self.release = threading.Event()
+
+    def tearDown(self):
+        self.release.set()
+        self.tmp.cleanup()
+
+    def _blocked_search(self, location, game_name, found, limit, max_depth, pe_cache, abandon):
+        # Stands in for a search stuck on an unresponsive drive
+        self.started.append(abandon)
+        self.release.wait(5)
+        return []
+
+    def test_stop_while_searches_are_blocked(self):
+        concurrency = 4
+
+        async def scan():
+            stop = asyncio.Event()
+            asyncio.get_running_loop().call_later(0.2, stop.set)
+            games = []
+            async for game in async_scan.iter_games(self.source, location_filter=None, concurrency=concurrency,
+                                                    stop=stop):
+                games.append(game)
+            return games
+
+        with mock.patch.object(async_scan, "_search", self._blocked_search):
+            started_at = time.monotonic()
+            cpu_at = time.process_time()
+            games = asyncio.run(asyncio.wait_for(scan(), 2))
+            elapsed = time.monotonic() - started_at
+            cpu = time.process_time() - cpu_at
+
+        self.assertEqual(games, [])
+        self.assertLess(elapsed, 1.0)
+        # A spinning wait loop would burn the whole interval on the CPU
+        self.assertLess(cpu, 0.5 * elapsed)
+        # Searches queued on the semaphore never started, running ones were abandoned
+        self.assertEqual(len(self.started), concurrency)
+        self.assertTrue(all(abandon.is_set() for abandon in self.started))
+
+    def test_abandoned_threads_stay_within_budget(self):
+        timed_out = []
+
+        async def scan():
+            return [game async for game in async_scan.iter_games(
+                self.source, location_filter=None, location_timeout=0.05, concurrency=2, max_threads=3,
+                timed_out=timed_out)]
+
+        with mock.patch.object(async_scan, "_search", self._blocked_search):
+            games = asyncio.run(asyncio.wait_for(scan(), 5))
+
+        self.assertGreater(len(games), 3)
+        self.assertEqual(len(timed_out), len(games))
+        # Every search hung like a dead share, so no thread beyond the budget was started
+        self.assertEqual(len(self.started), 3)
+        self.assertTrue(all(game.executables == [] for game in games))
+
+
+class StreamingTest(unittest.TestCase):
+
+    def test_searches_start_while_registry_is_read(self):
+        def slow_registry(*args, **kwargs):
+            for i in range(10):
+                time.sleep(0.1)
+                yield Program(f"Game {i}", f"D:\\Games\\Game {i}", "Ubisoft")
+
+        async def first_game():
+            games = async_scan.iter_games(location_filter=None)
+            try:
+                return await games.__anext__()
+            finally:
+                await games.aclose()
+
+        with mock.patch.object(async_scan.scanner, "iter_games", slow_registry), \
+                mock.patch.object(async_scan, "_search", lambda *args: []):
+            started_at = time.monotonic()
+            game = asyncio.run(asyncio.wait_for(first_game(), 5))
+            elapsed = time.monotonic() - started_at
+
+        self.assertEqual(game.name, "Game 0")
+        # Reading the whole registry takes 1 s
+        self.assertLess(elapsed, 0.5)
+
+
+if __name__ == "__main__":
+    unittest.main()
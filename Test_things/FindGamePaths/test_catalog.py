@@ -0,0 +1,93 @@
+"""
+Row identity of the SQLite game catalog across rescans.
+
+    python -m unittest test_catalog
+"""
+import os
+import sqlite3
+import tempfile
+import unittest
+
+import FindGamesInstalled as scanner
+from catalog import GameCatalog
+from registry_source import SnapshotSource
+from synthetic import synthetic_registry
+
+
+class CatalogTest(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmp.name, "catalog.sqlite")
+        # duplicate_ratio repeats HKLM entries under WOW6432Node with the same name and path
+        self.data = synthetic_registry(2000, duplicate_ratio=0.2)
+        self.steam_root = os.path.join(self.tmp.name, "Steam")
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def scan(self, data=None, merge=False):
+        with GameCatalog(self.path) as catalog:
+            programs = list(scanner.iter_programs(SnapshotSource(data or self.data), steam_root=self.steam_root))
+            if merge:
+                programs = scanner.merge_programs(programs)
+            for program in programs:
+                catalog.record_program(program, False)
+            catalog.finish_scan()
+            return len(programs), catalog.inserted_or_updated, catalog.unchanged, catalog.count()
+
+    def test_every_program_keeps_its_row(self):
+        programs, written, unchanged, rows = self.scan()
+        self.assertEqual((written, unchanged, rows), (programs, 0, programs))
+
+        programs, written, unchanged, rows = self.scan()
+        self.assertEqual((written, unchanged, rows), (0, programs, programs))
+
+    def test_merged_scan(self):
+        programs, written, _, rows = self.scan(merge=True)
+        self.assertEqual(written, programs)
+        self.assertEqual(rows, programs)
+
+    def test_change_rewrites_one_row(self):
+        programs, _, _, _ = self.scan()
+        hive = next(iter(self.data.values()))
+        node = next(iter(next(iter(hive["subkeys"].values()))["subkeys"].values()))
+        while "DisplayName" not in node.get("values", {}):
+            node = next(iter(node["subkeys"].values()))
+        node["values"]["DisplayName"] += " Remastered"
+        _, written, unchanged, rows = self.scan()
+        self.assertEqual((written, unchanged, rows), (1, programs - 1, programs))
+
+    def test_executables_attach_to_their_own_row(self):
+        programs = list(scanner.iter_programs(SnapshotSource(self.data), steam_root=self.steam_root))
+        seen = {}
+        for program in programs:
+            other = seen.setdefault((program['name'], program['install_location']), program)
+            if other is not program:
+                break
+        else:
+            self.fail("the snapshot has no same name and path duplicates")
+
+        with GameCatalog(self.path) as catalog:
+            for record in programs:
+                catalog.record_program(record, True)
+            program.executables = ["D:\\Game\\game.exe"]
+            catalog.record_executables(program)
+            catalog.finish_scan()
+            owners = catalog.conn.execute(
+                "SELECT DISTINCT p.source_key FROM programs p JOIN executables e ON e.program_id = p.id").fetchall()
+        self.assertNotEqual(program['source_key'], other['source_key'])
+        self.assertEqual(owners, [(program['source_key'],)])
+
+    def test_old_schema_is_rebuilt(self):
+        conn = sqlite3.connect(self.path)
+        conn.execute("CREATE TABLE programs (id INTEGER PRIMARY KEY, merge_key TEXT NOT NULL UNIQUE)")
+        conn.execute("PRAGMA user_version=1")
+        conn.commit()
+        conn.close()
+        programs, written, _, rows = self.scan()
+        self.assertEqual((written, rows), (programs, programs))
+
+
+if __name__ == "__main__":
+    unittest.main()
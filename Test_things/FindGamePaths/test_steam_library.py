@@ -0,0 +1,101 @@
+"""
+Steam VDF/ACF parsing and the library index, on the fixtures under
+fixtures/steam (Steam root) and fixtures/steam_library2.
+
+    python -m unittest test_steam_library
+"""
+import os
+import shutil
+import tempfile
+import unittest
+
+import FindGamesInstalled as scanner
+import steam_library
+from registry_source import HKLM, SnapshotSource
+
+FIXTURES = os.path.join(os.path.dirname(os.path.abspath(__file__)), "fixtures")
+
+
+def _node(values=None, subkeys=None):
+    return {"values": values or {}, "subkeys": subkeys or {}}
+
+
+class ParseTest(unittest.TestCase):
+
+    def test_library_folders(self):
+        root = os.path.join(FIXTURES, "steam")
+        self.assertEqual(steam_library.library_folders(root),
+                         [root, "C:\\Program Files (x86)\\Steam", "D:\\SteamLibrary"])
+
+    def test_legacy_library_folders(self):
+        data = steam_library.load_vdf(os.path.join(FIXTURES, "steam", "libraryfolders_legacy.vdf"))
+        self.assertEqual(data["LibraryFolders"]["1"], "D:\\SteamLibrary")
+        self.assertEqual(data["LibraryFolders"]["2"], "E:\\Games\\Steam")
+        self.assertNotIn("//", repr(data))
+
+    def test_escapes(self):
+        data = steam_library.load_vdf(os.path.join(FIXTURES, "steam", "steamapps", "libraryfolders.vdf"))
+        self.assertEqual(data["libraryfolders"]["1"]["label"], 'Games "fast" drive')
+
+    def test_unbalanced(self):
+        with self.assertRaises(ValueError):
+            steam_library.parse_vdf('"a" { "b" "c" } }')
+
+    def test_manifest_states(self):
+        steamapps = os.path.join(FIXTURES, "steam", "steamapps")
+        read = lambda app_id: steam_library.read_app_manifest(
+            os.path.join(steamapps, f"appmanifest_{app_id}.acf"), "lib")
+        self.assertEqual(read(10)['install_dir'], os.path.join("lib", "steamapps", "common", "Alpha"))
+        # Mid-update (UpdateRequired | UpdateStarted) is still on disk
+        self.assertEqual(read(20)['name'], "Beta Run")
+        self.assertIsNone(read(30))
+
+
+class IndexTest(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.root = os.path.join(self.tmp.name, "Steam")
+        self.library2 = os.path.join(self.tmp.name, "SteamLibrary")
+        shutil.copytree(os.path.join(FIXTURES, "steam"), self.root)
+        shutil.copytree(os.path.join(FIXTURES, "steam_library2"), self.library2)
+        # The fixture's own library paths are Windows paths; point the second one here
+        with open(os.path.join(self.root, "steamapps", "libraryfolders.vdf"), "w", encoding="utf-8") as f:
+            f.write('"libraryfolders" { "0" { "path" "%s" } "1" { "path" "%s" } }'
+                    % (self.root.replace("\\", "\\\\"), self.library2.replace("\\", "\\\\")))
+        self.cache_path = os.path.join(self.tmp.name, "steam_index.json")
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_index(self):
+        index = steam_library.build_app_index(self.root, self.cache_path)
+        # 30 is marked uninstalled, 40 has no install directory
+        self.assertEqual(sorted(index), ["10", "20", "50"])
+        self.assertEqual(index["50"]['install_dir'], os.path.join(self.library2, "steamapps", "common", "Delta"))
+        self.assertEqual(index["50"]['library'], self.library2)
+
+    def test_cached_index_rechecks_directories(self):
+        steam_library.build_app_index(self.root, self.cache_path)
+        shutil.rmtree(os.path.join(self.root, "steamapps", "common", "Alpha"))
+        self.assertEqual(sorted(steam_library.build_app_index(self.root, self.cache_path)), ["20", "50"])
+
+    def test_steam_games_use_manifest_directories(self):
+        apps = {app_id: _node({"Name": name, "Installed": 1})
+                for app_id, name in (("10", "Alpha Strike"), ("20", "Beta Run"), ("50", "Delta Force"))}
+        data = {HKLM: _node()}
+        node = data[HKLM]
+        for part in scanner.STEAM_PATH.split("\\"):
+            node = node["subkeys"].setdefault(part, _node())
+        node["values"]["InstallPath"] = self.root
+        node["subkeys"]["Apps"] = _node(subkeys=apps)
+
+        games = scanner.get_steam_games(SnapshotSource(data), library_cache=self.cache_path)
+        locations = {game.app_id: game.install_location for game in games}
+        self.assertEqual(locations["20"], os.path.join(self.root, "steamapps", "common", "Beta"))
+        self.assertEqual(locations["50"], os.path.join(self.library2, "steamapps", "common", "Delta"))
+        self.assertNotIn(self.root, locations.values())
+
+
+if __name__ == "__main__":
+    unittest.main()
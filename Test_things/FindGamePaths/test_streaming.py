@@ -0,0 +1,40 @@
+"""
+Latency and ordering of streaming.ordered_imap.
+
+    python -m unittest test_streaming
+"""
+import time
+import unittest
+
+from streaming import ordered_imap
+
+
+class OrderedImapTest(unittest.TestCase):
+
+    def test_first_result_does_not_wait_for_window(self):
+        def slow_input():
+            # Like games trickling out of a registry read
+            for i in range(20):
+                time.sleep(0.1)
+                yield i
+
+        started = time.monotonic()
+        results = ordered_imap(lambda x: x * 2, slow_input(), workers=8)
+        first = next(results)
+        elapsed = time.monotonic() - started
+        results.close()
+
+        self.assertEqual(first, 0)
+        # The window is 16 items, 1.6 s of input; the first result needs at most two
+        self.assertLess(elapsed, 0.5)
+
+    def test_order_is_preserved(self):
+        def jittered(x):
+            time.sleep(0.01 * (x % 3))
+            return x
+
+        self.assertEqual(list(ordered_imap(jittered, range(50), workers=4)), list(range(50)))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,93 @@
+"""
+Watch mode on a snapshot registry and temporary install directories.
+
+    python -m unittest test_watch
+"""
+import os
+import tempfile
+import unittest
+
+import FindGamesInstalled as scanner
+from registry_source import SnapshotSource
+from synthetic import write_pe
+from watch import Watcher
+
+UNINSTALL_HIVE, UNINSTALL_PATH = scanner.UNINSTALL_PATHS[0]
+
+
+class WatchTest(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.data = {UNINSTALL_HIVE: {"values": {}, "subkeys": {}}}
+        node = self.data[UNINSTALL_HIVE]
+        for part in UNINSTALL_PATH.split("\\"):
+            node = node["subkeys"].setdefault(part, {"values": {}, "subkeys": {}})
+        self.uninstall = node["subkeys"]
+        self.timestamp = 132000000000000000
+        for name in ("Alpha", "Beta", "Gamma"):
+            self.install(name)
+        self.watcher = Watcher(SnapshotSource(self.data), steam_root=os.path.join(self.tmp.name, "Steam"))
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def install(self, name, publisher="Ubisoft"):
+        location = os.path.join(self.tmp.name, name)
+        os.makedirs(location, exist_ok=True)
+        write_pe(os.path.join(location, f"{name}.exe"), 4096)
+        self.timestamp += 1
+        self.uninstall[name] = {
+            "values": {"DisplayName": f"{name} Quest", "Publisher": publisher, "InstallLocation": location},
+            "subkeys": {},
+            "timestamp": self.timestamp,
+        }
+        return location
+
+    def events(self):
+        return sorted((event["event"], event["game"]["name"]) for event in self.watcher.poll())
+
+    def test_first_poll_adds_everything(self):
+        self.assertEqual(self.events(), [("add", "Alpha Quest"), ("add", "Beta Quest"), ("add", "Gamma Quest")])
+        self.assertEqual(self.watcher.crawled, 3)
+        game = next(game for game in self.watcher.games.values() if game['name'] == "Alpha Quest")
+        self.assertEqual([os.path.basename(exe) for exe in game['executables']], ["Alpha.exe"])
+
+    def test_unchanged_poll_skips_recrawls(self):
+        self.events()
+        extracted = self.watcher.extracted
+        self.assertEqual(self.events(), [])
+        self.assertEqual(self.watcher.crawled, 3)
+        self.assertEqual(self.watcher.extracted, extracted)
+
+    def test_add_change_remove(self):
+        self.events()
+        self.install("Delta")
+        self.assertEqual(self.events(), [("add", "Delta Quest")])
+        self.assertEqual(self.watcher.crawled, 4)
+
+        entry = self.uninstall["Beta"]
+        entry["values"]["Publisher"] = "Electronic Arts"
+        self.timestamp += 1
+        entry["timestamp"] = self.timestamp
+        self.assertEqual(self.events(), [("change", "Beta Quest")])
+        # Only the stale subkey is re-extracted
+        self.assertEqual(self.watcher.extracted, 5)
+
+        del self.uninstall["Gamma"]
+        self.assertEqual(self.events(), [("remove", "Gamma Quest")])
+        self.assertEqual(self.watcher.crawled, 5)
+
+    def test_new_executable_recrawls_only_its_directory(self):
+        self.events()
+        location = os.path.join(self.tmp.name, "Alpha")
+        write_pe(os.path.join(location, "AlphaEditor.exe"), 2048)
+        # mtime resolution can be coarse; make the directory change visible
+        stat = os.stat(location)
+        os.utime(location, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10 ** 9))
+        self.assertEqual(self.events(), [("change", "Alpha Quest")])
+        self.assertEqual(self.watcher.crawled, 4)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,260 @@
+"""
+Watch mode: keep the last scan in memory and rescan only what changed.
+
+Every interval the watcher polls cheap change signals:
+
+  * RegistrySignal  - last-write timestamps of the Uninstall subkeys
+  * SteamSignal     - mtimes of libraryfolders.vdf and the app manifests
+  * DirectorySignal - mtime of each game's install directory
+
+A signal is anything with a poll() method returning {key: token}; a key
+whose token changed is stale. Only stale registry subkeys are re-extracted
+and only games whose install directory changed (or that are new) are
+crawled for executables again. Differences in the resulting game list are
+reported as add/remove/change events.
+"""
+import json
+import os
+import sys
+import time
+
+import FindGamesInstalled as scanner
+from classifier import DEFAULT_CLASSIFIER
+from merge import DEFAULT_PRECEDENCE, merge_key, merge_programs
+from steam_library import library_folders, manifest_files
+
+
+class RegistrySignal:
+    """
+    {(hive, path, subkey): last_write} over the Uninstall hives.
+    Snapshot keys without a timestamp are read once and then never look changed.
+    """
+
+    def __init__(self, source, roots=None):
+        self.source = source
+        self.roots = roots or scanner.UNINSTALL_PATHS
+
+    def poll(self):
+        tokens = {}
+        for hive, path in self.roots:
+            try:
+                entries = self.source.enum_subkeys_with_timestamps(hive, path)
+            except OSError:
+                continue
+            for name, timestamp in entries:
+                tokens[(hive, path, name)] = timestamp
+        return tokens
+
+
+class SteamSignal:
+    """
+    {file: mtime_ns} for libraryfolders.vdf and every app manifest.
+    """
+
+    def __init__(self, steam_root):
+        self.steam_root = steam_root
+
+    def poll(self):
+        if not self.steam_root:
+            return {}
+        tokens = {}
+        try:
+            library_file = os.path.join(self.steam_root, "steamapps", "libraryfolders.vdf")
+            tokens[library_file] = os.stat(library_file).st_mtime_ns
+        except OSError:
+            pass
+        for library in library_folders(self.steam_root):
+            tokens.update(manifest_files(library))
+        return tokens
+
+
+class DirectorySignal:
+    """
+    {install_location: mtime_ns} of the top-level install directories.
+    Adding or removing files directly in a directory changes its mtime.
+    """
+
+    def __init__(self):
+        self.locations = ()
+
+    def poll(self):
+        tokens = {}
+        for location in self.locations:
+            try:
+                tokens[location] = os.stat(location).st_mtime_ns
+            except (OSError, TypeError, ValueError):
+                tokens[location] = None
+        return tokens
+
+
+def _game_key(program):
+    return "\x1f".join(merge_key(program))
+
+
+class Watcher:
+    """
+    Incremental scanner state. Call poll() repeatedly; the first call does
+    a full scan and reports every game as added.
+    """
+
+    def __init__(self, source, classifier=None, location_filter=None, steam_root=None,
+                 precedence=DEFAULT_PRECEDENCE, max_depth=scanner.DEFAULT_MAX_DEPTH, pe_cache=None,
+                 library_cache=False, registry_signal=None, steam_signal=None, directory_signal=None):
+        self.source = source
+        self.classifier = classifier or DEFAULT_CLASSIFIER
+        self.location_filter = location_filter
+        self.precedence = precedence
+        self.max_depth = max_depth
+        self.pe_cache = pe_cache
+        self.library_cache = library_cache
+        if steam_root is None:
+            try:
+                steam_root = source.query_values(scanner.HKLM, scanner.STEAM_PATH, ("InstallPath",)).get("InstallPath")
+            except OSError:
+                steam_root = None
+        self.steam_root = steam_root
+
+        self.registry_signal = registry_signal or RegistrySignal(source)
+        self.steam_signal = steam_signal or SteamSignal(steam_root)
+        self.directory_signal = directory_signal or DirectorySignal()
+
+        self.registry_entries = {}   # (hive, path, subkey) -> Program or None
+        self.steam_games = []
+        self.games = {}              # game key -> Program with executables
+        self._reported = {}          # game key -> fields as last reported
+        self._tokens = {"registry": None, "steam": None, "directories": {}}
+        self.extracted = 0
+        self.crawled = 0
+
+    def _refresh_registry(self):
+        tokens = self.registry_signal.poll()
+        previous = self._tokens["registry"]
+        if previous is not None and tokens == previous:
+            return False
+        previous = previous or {}
+        stale = [key for key, token in tokens.items() if key not in previous or previous[key] != token]
+
+        labels = dict(zip(scanner.UNINSTALL_PATHS, scanner.UNINSTALL_SOURCES))
+        by_root = {}
+        for hive, path, name in stale:
+            by_root.setdefault((hive, path), []).append(name)
+        for (hive, path), names in by_root.items():
+            for name, program in zip(names, scanner._read_program_batch(self.source, hive, path, names)):
+                if program is not None:
+                    program.source = labels.get((hive, path))
+                    program.source_key = f"{hive}\\{path}\\{name}"
+                self.registry_entries[(hive, path, name)] = program
+            self.extracted += len(names)
+
+        # Keep registry order and drop deleted subkeys
+        self.registry_entries = {key: self.registry_entries.get(key) for key in tokens}
+        self._tokens["registry"] = tokens
+        return True
+
+    def _refresh_steam(self):
+        tokens = self.steam_signal.poll()
+        if self._tokens["steam"] is not None and tokens == self._tokens["steam"]:
+            return False
+        self.steam_games = scanner.get_steam_games(self.source, self.steam_root, self.library_cache)
+        self._tokens["steam"] = tokens
+        return True
+
+    def _candidates(self):
+        programs = [program for program in self.registry_entries.values() if program is not None]
+        candidates = {}
+        for program in merge_programs(programs + self.steam_games, self.precedence):
+            if not self.classifier.is_game(program):
+                continue
+            if self.location_filter is not None and not self.location_filter(program):
+                continue
+            candidates[_game_key(program)] = program
+        return candidates
+
+    def poll(self):
+        """
+        Check the signals once and return a list of events.
+        """
+        registry_changed = self._refresh_registry()
+        steam_changed = self._refresh_steam()
+        if registry_changed or steam_changed:
+            candidates = self._candidates()
+        else:
+            candidates = self.games
+
+        self.directory_signal.locations = sorted({game['install_location'] for game in candidates.values()
+                                                  if game['install_location']})
+        directory_tokens = self.directory_signal.poll()
+        old_tokens = self._tokens["directories"]
+        self._tokens["directories"] = directory_tokens
+
+        events = []
+        games = {}
+        reported = {}
+        for key, game in candidates.items():
+            old = self.games.get(key)
+            previous = self._reported.get(key)
+            location = game['install_location']
+            if (old is None or previous[:-1] != _fields(game)
+                    or old_tokens.get(location) != directory_tokens.get(location)):
+                game.executables = scanner.find_game_executables(
+                    location, max_depth=self.max_depth, game_name=game['name'], pe_cache=self.pe_cache)
+                self.crawled += 1
+            else:
+                game.executables = old.executables
+            games[key] = game
+            reported[key] = _fields(game, True)
+            if old is None:
+                events.append(_event("add", game))
+            elif previous != reported[key]:
+                events.append(_event("change", game))
+        for key, old in self.games.items():
+            if key not in games:
+                events.append(_event("remove", old))
+
+        self.games = games
+        self._reported = reported
+        return events
+
+    def run(self, interval=5.0, emit=None, iterations=None):
+        """
+        Poll every interval seconds and pass each event to emit (default:
+        print as a JSON line). iterations limits the number of polls.
+        """
+        emit = emit or emit_json_line
+        count = 0
+        while iterations is None or count < iterations:
+            started = time.monotonic()
+            for event in self.poll():
+                emit(event)
+            count += 1
+            if iterations is not None and count >= iterations:
+                break
+            time.sleep(max(0.0, interval - (time.monotonic() - started)))
+
+
+def _fields(program, with_executables=False):
+    fields = (program['name'], program['install_location'], program['publisher'], program.get('app_id'))
+    if with_executables:
+        fields += (tuple(program.get('executables') or ()),)
+    return fields
+
+
+def _event(kind, program):
+    return {
+        "event": kind,
+        "time": time.time(),
+        "game": {
+            "name": program['name'],
+            "install_location": program['install_location'],
+            "publisher": program['publisher'],
+            "app_id": program.get('app_id'),
+            "source": program.get('source'),
+            "executables": program.get('executables'),
+        },
+    }
+
+
+def emit_json_line(event, stream=None):
+    stream = stream or sys.stdout
+    stream.write(json.dumps(event) + "\n")
+    stream.flush()
@@ -0,0 +1,151 @@
+"""
+Executable icon loader for the Qt window.
+
+Icons are looked up in an in-memory LRU keyed by (path, size), then in a
+PNG cache under the per-user cache directory keyed by (path, size, mtime),
+and only then extracted from the file. The file is only stat'ed, read and
+extracted on a QThreadPool, never on the GUI thread: callers get a
+placeholder right away and iconReady fires once the real icon is there.
+An icon in memory is not checked against its file again until clear().
+"""
+import hashlib
+import os
+from collections import OrderedDict
+
+from PyQt6.QtCore import QFileInfo, QObject, QRunnable, QStandardPaths, QThreadPool, pyqtSignal
+from PyQt6.QtGui import QIcon, QImage, QPixmap
+from PyQt6.QtWidgets import QApplication, QFileIconProvider, QStyle
+
+DEFAULT_CAPACITY = 512
+
+
+def default_icon_cache_dir():
+    base = QStandardPaths.writableLocation(QStandardPaths.StandardLocation.CacheLocation)
+    return os.path.join(base or os.path.expanduser("~/.cache"), "icons")
+
+
+def _disk_key(path, size):
+    try:
+        mtime = os.stat(path).st_mtime_ns
+    except (OSError, ValueError):
+        mtime = None
+    return (os.path.normcase(os.path.abspath(path)), size, mtime)
+
+
+def _cache_file(cache_dir, key):
+    if not cache_dir:
+        return None
+    digest = hashlib.sha1(repr(key).encode("utf-8")).hexdigest()
+    return os.path.join(cache_dir, digest + ".png")
+
+
+class _LoaderSignals(QObject):
+    # ((path, size), image); image is null when no icon could be loaded
+    loaded = pyqtSignal(object, QImage)
+
+
+class _IconLoader(QRunnable):
+    """
+    Loads one icon off the GUI thread as a QImage, from the disk cache if
+    possible, else from the file, and writes new icons back to the cache.
+    """
+
+    def __init__(self, key, cache_dir, signals):
+        super().__init__()
+        self.key = key
+        self.cache_dir = cache_dir
+        self.signals = signals
+
+    def run(self):
+        path, size = self.key
+        cache_file = _cache_file(self.cache_dir, _disk_key(path, size))
+        image = QImage()
+        if cache_file and os.path.exists(cache_file):
+            image.load(cache_file)
+        if image.isNull():
+            # QFileSystemModel resolves icons on a worker thread the same way
+            icon = QFileIconProvider().icon(QFileInfo(path))
+            image = icon.pixmap(size, size).toImage()
+            if not image.isNull() and cache_file:
+                try:
+                    os.makedirs(os.path.dirname(cache_file), exist_ok=True)
+                    tmp_file = cache_file + ".tmp.png"
+                    if image.save(tmp_file, "PNG"):
+                        os.replace(tmp_file, cache_file)
+                except OSError:
+                    pass
+        self.signals.loaded.emit(self.key, image)
+
+
+class IconService(QObject):
+    """
+    Asynchronous, cached icons for executables.
+
+    icon(path, size) returns the icon if it is cached in memory, otherwise
+    a placeholder, and starts a background load that ends with
+    iconReady(path, size, icon). Concurrent requests for the same icon
+    share one load. cache_dir=False disables the disk cache.
+    """
+
+    iconReady = pyqtSignal(str, int, QIcon)
+
+    def __init__(self, parent=None, cache_dir=None, capacity=DEFAULT_CAPACITY, pool=None):
+        super().__init__(parent)
+        self.cache_dir = default_icon_cache_dir() if cache_dir is None else cache_dir
+        self.capacity = capacity
+        self.pool = pool or QThreadPool.globalInstance()
+        self._icons = OrderedDict()   # (path, size) -> QIcon, least recently used first
+        self._pending = set()         # (path, size) being loaded
+        self._placeholders = {}
+        self._signals = _LoaderSignals(self)
+        self._signals.loaded.connect(self._on_loaded)
+        self.hits = 0
+        self.misses = 0
+
+    def placeholder(self, size=32):
+        icon = self._placeholders.get(size)
+        if icon is None:
+            style = QApplication.style()
+            icon = style.standardIcon(QStyle.StandardPixmap.SP_FileIcon) if style else QIcon()
+            self._placeholders[size] = icon
+        return icon
+
+    def cached(self, path, size=32):
+        """
+        Return the icon if it is in memory, else None. Never starts a load.
+        """
+        key = (path, size)
+        icon = self._icons.get(key)
+        if icon is not None:
+            self._icons.move_to_end(key)
+        return icon
+
+    def icon(self, path, size=32):
+        # Called for every visible row on every repaint, so no filesystem access here
+        key = (path, size)
+        icon = self._icons.get(key)
+        if icon is not None:
+            self._icons.move_to_end(key)
+            self.hits += 1
+            return icon
+        self.misses += 1
+        if key not in self._pending:
+            self._pending.add(key)
+            self.pool.start(_IconLoader(key, self.cache_dir, self._signals))
+        return self.placeholder(size)
+
+    def _on_loaded(self, key, image):
+        self._pending.discard(key)
+        path, size = key
+        if image.isNull():
+            icon = self.placeholder(size)
+        else:
+            icon = QIcon(QPixmap.fromImage(image))
+        self._icons[key] = icon
+        self._icons.move_to_end(key)
+        while len(self._icons) > self.capacity:
+            self._icons.popitem(last=False)
+        self.iconReady.emit(path, size, icon)
+
+    def clear(self):
+        self._icons.clear()
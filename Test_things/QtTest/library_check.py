@@ -0,0 +1,90 @@
+"""
+Offscreen check that the library filter searches every scanned game.
+
+    python library_check.py [--games 30000]
+
+Streams --games synthetic games into a LibraryPanel, types a filter for
+the last one before the scan has finished and checks that the filtered
+view finds it once the batches are in. Without a filter the model must
+still expose rows lazily, one chunk at a time.
+"""
+import argparse
+import os
+import sys
+import time
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+from PyQt6.QtWidgets import QApplication
+
+from library_view import FETCH_CHUNK, LibraryPanel
+
+TIMEOUT = 30
+
+
+def _scan(count):
+    def scan():
+        for i in range(count):
+            yield {'name': f"Game {i}", 'install_location': f"D:\\Games\\Game {i}", 'publisher': "Indie Studio",
+                   'executables': None}
+    return scan
+
+
+def _wait(app, done):
+    deadline = time.monotonic() + TIMEOUT
+    while not done() and time.monotonic() < deadline:
+        app.processEvents()
+        time.sleep(0.01)
+    return done()
+
+
+def run(count):
+    """
+    Return (rows exposed without a filter, rows matching the last game
+    while it streamed in, rows matching it after a finished rescan, rows
+    after clearing the filter, games in the model).
+    """
+    app = QApplication.instance() or QApplication(sys.argv)
+    target = f"Game {count - 1}"
+    panel = LibraryPanel(scan=_scan(count), find_executables=lambda game: [])
+    panel.resize(400, 600)
+    panel.show()
+
+    panel.start_scan()
+    # Filter typed while the scan is still streaming in
+    panel.filterEdit.setText(target)
+    if not _wait(app, lambda: panel.worker is None):
+        sys.exit("FAIL: the scan did not finish")
+    filtered = panel.proxy.rowCount()
+
+    panel.filterEdit.clear()
+    panel.scan = _scan(count)
+    panel.start_scan()
+    if not _wait(app, lambda: panel.worker is None):
+        sys.exit("FAIL: the rescan did not finish")
+    lazy = panel.model.rowCount()
+    panel.filterEdit.setText(target)
+    refiltered = panel.proxy.rowCount()
+    panel.filterEdit.clear()
+    return lazy, filtered, refiltered, panel.proxy.rowCount(), panel.model.total()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Library filter check")
+    parser.add_argument("--games", type=int, default=30000)
+    args = parser.parse_args(argv)
+
+    lazy, filtered, refiltered, cleared, total = run(args.games)
+    print(f"{total} games: {lazy} rows exposed without a filter, {filtered} match while scanning, "
+          f"{refiltered} match after the scan, {cleared} rows after clearing the filter")
+    if total != args.games:
+        sys.exit(f"FAIL: the model holds {total} games")
+    if filtered != 1 or refiltered != 1:
+        sys.exit("FAIL: the filter does not see every game")
+    if lazy > 2 * FETCH_CHUNK:
+        sys.exit("FAIL: rows are no longer exposed lazily")
+    print("ok")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,327 @@
+"""
+Game library panel for the Qt window.
+
+The scan from FindGamePaths runs on a daemon thread and streams games to
+GameListModel in batches. Stopping a scan never waits for that thread: a
+registry read can block for a long time, and a QThread destroyed while
+running aborts the process, so the worker is told to stop, closes the
+scan at its next game, and its leftover batches are dropped by scan
+generation. The model only exposes rows to the view in
+chunks (canFetchMore/fetchMore), and executables and icons are looked up
+the first time the view asks for a row's icon, which it only does for
+rows on screen. A QSortFilterProxyModel filters by name and publisher;
+it only sees rows the model has exposed, so while filter text is entered
+every row is exposed, including those of batches still arriving.
+"""
+import os
+import sys
+import threading
+import time
+
+from PyQt6.QtCore import (QAbstractListModel, QModelIndex, QObject, QRunnable, QSize, QSortFilterProxyModel, Qt,
+                          QThreadPool, pyqtSignal)
+from PyQt6.QtWidgets import QLabel, QLineEdit, QListView, QVBoxLayout, QWidget
+
+# Rows handed to the view per fetchMore
+FETCH_CHUNK = 200
+# Worker emits a batch at this many games or after this many seconds
+SCAN_BATCH_SIZE = 100
+SCAN_BATCH_SECONDS = 0.1
+
+ICON_SIZE = 32
+
+GameRole = Qt.ItemDataRole.UserRole
+SearchRole = Qt.ItemDataRole.UserRole + 1
+
+_SCANNER_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "FindGamePaths")
+
+
+def _scanner():
+    # FindGamePaths is a sibling script folder, not an installed package
+    if _SCANNER_DIR not in sys.path:
+        sys.path.insert(0, _SCANNER_DIR)
+    import FindGamesInstalled
+    return FindGamesInstalled
+
+
+def default_scan():
+    """
+    Every installed game, without executables, using the scan cache.
+    """
+    scanner = _scanner()
+    cache = scanner.ScanCache()
+    yield from scanner.iter_games(location_filter=None, find_exes=False, cache=cache)
+    cache.save()
+
+
+def default_find_executables(game):
+    return _scanner().find_game_executables(game['install_location'], game_name=game['name'])
+
+
+class ScanWorker(QObject):
+    """
+    Runs scan() on a daemon thread and emits the games in batches. Every
+    signal carries generation so the receiver can tell scans apart.
+    """
+
+    # (generation, games)
+    batch = pyqtSignal(int, list)
+    failed = pyqtSignal(int, str)
+    finished = pyqtSignal(int)
+
+    def __init__(self, scan=default_scan, generation=0):
+        super().__init__()
+        self.scan = scan
+        self.generation = generation
+        self._stop = False
+
+    def start(self):
+        threading.Thread(target=self.run, name="library-scan", daemon=True).start()
+
+    def stop(self):
+        self._stop = True
+
+    def run(self):
+        pending = []
+        last_emit = time.monotonic()
+        try:
+            games = iter(self.scan())
+            try:
+                for game in games:
+                    if self._stop:
+                        break
+                    pending.append(game)
+                    if len(pending) >= SCAN_BATCH_SIZE or time.monotonic() - last_emit >= SCAN_BATCH_SECONDS:
+                        self.batch.emit(self.generation, pending)
+                        pending = []
+                        last_emit = time.monotonic()
+            finally:
+                # Shuts the scan's own workers down now, not when the generator is collected
+                close = getattr(games, "close", None)
+                if close is not None:
+                    close()
+            if pending and not self._stop:
+                self.batch.emit(self.generation, pending)
+        except Exception as e:  # shown in the panel instead of killing the thread
+            self.failed.emit(self.generation, str(e))
+        self.finished.emit(self.generation)
+
+
+class _ExecutableSignals(QObject):
+    # (generation, row, executables)
+    found = pyqtSignal(int, int, list)
+
+
+class _ExecutableLookup(QRunnable):
+    def __init__(self, generation, row, game, find_executables, signals):
+        super().__init__()
+        self.generation = generation
+        self.row = row
+        self.game = game
+        self.find_executables = find_executables
+        self.signals = signals
+
+    def run(self):
+        try:
+            executables = list(self.find_executables(self.game) or [])
+        except OSError:
+            executables = []
+        self.signals.found.emit(self.generation, self.row, executables)
+
+
+class GameListModel(QAbstractListModel):
+    """
+    Append-only list of games. Rows arrive through add_games() and are
+    exposed to views FETCH_CHUNK at a time.
+
+    With an IconService the decoration is the icon of the game's first
+    executable; executables are searched in the background on first use.
+    """
+
+    def __init__(self, parent=None, icons=None, find_executables=default_find_executables, pool=None):
+        super().__init__(parent)
+        self.icons = icons
+        self.find_executables = find_executables
+        self.pool = pool or QThreadPool.globalInstance()
+        self._games = []
+        self._loaded = 0
+        self._generation = 0
+        self._executables = {}       # row -> list, once searched
+        self._looking_up = set()
+        self._rows_by_exe = {}       # executable -> rows showing its icon
+        self._signals = _ExecutableSignals(self)
+        self._signals.found.connect(self._on_executables)
+        if icons is not None:
+            icons.iconReady.connect(self._on_icon)
+
+    def clear(self):
+        self.beginResetModel()
+        self._games = []
+        self._loaded = 0
+        self._generation += 1
+        self._executables = {}
+        self._looking_up = set()
+        self._rows_by_exe = {}
+        self.endResetModel()
+
+    def add_games(self, games):
+        """
+        Buffer a batch of games. Rows become visible through fetchMore; the
+        first chunk is exposed right away so an empty view fills up.
+        """
+        self._games.extend(games)
+        if self._loaded < FETCH_CHUNK and self.canFetchMore(QModelIndex()):
+            self.fetchMore(QModelIndex())
+
+    def total(self):
+        return len(self._games)
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else self._loaded
+
+    def canFetchMore(self, parent):
+        return not parent.isValid() and self._loaded < len(self._games)
+
+    def fetchMore(self, parent, limit=FETCH_CHUNK):
+        if parent.isValid():
+            return
+        count = min(limit, len(self._games) - self._loaded)
+        if count <= 0:
+            return
+        self.beginInsertRows(QModelIndex(), self._loaded, self._loaded + count - 1)
+        self._loaded += count
+        self.endInsertRows()
+
+    def fetch_all(self):
+        """
+        Expose every buffered row at once, e.g. so a filter sees all of them.
+        """
+        self.fetchMore(QModelIndex(), len(self._games))
+
+    def data(self, index, role=Qt.ItemDataRole.DisplayRole):
+        if not index.isValid() or index.row() >= self._loaded:
+            return None
+        row = index.row()
+        game = self._games[row]
+        if role == Qt.ItemDataRole.DisplayRole:
+            return game['name']
+        if role == SearchRole:
+            return f"{game['name']} {game['publisher'] or ''}"
+        if role == Qt.ItemDataRole.ToolTipRole:
+            lines = [game['install_location'] or "Unknown location"]
+            if game['publisher']:
+                lines.insert(0, game['publisher'])
+            lines.extend(self._executables.get(row, [])[:3])
+            return "\n".join(lines)
+        if role == Qt.ItemDataRole.DecorationRole and self.icons is not None:
+            return self._icon(row, game)
+        if role == GameRole:
+            return game
+        return None
+
+    def _icon(self, row, game):
+        executables = self._executables.get(row)
+        if executables is None:
+            if row not in self._looking_up:
+                self._looking_up.add(row)
+                self.pool.start(_ExecutableLookup(self._generation, row, game, self.find_executables, self._signals))
+            return self.icons.placeholder(ICON_SIZE)
+        if not executables:
+            return self.icons.placeholder(ICON_SIZE)
+        self._rows_by_exe.setdefault(executables[0], set()).add(row)
+        return self.icons.icon(executables[0], ICON_SIZE)
+
+    def _on_executables(self, generation, row, executables):
+        if generation != self._generation:
+            return
+        self._looking_up.discard(row)
+        self._executables[row] = executables
+        if self._games[row].get('executables') is None:
+            self._games[row]['executables'] = executables
+        if row < self._loaded:
+            index = self.index(row)
+            self.dataChanged.emit(index, index, [Qt.ItemDataRole.DecorationRole, Qt.ItemDataRole.ToolTipRole])
+
+    def _on_icon(self, path, size, icon):
+        for row in self._rows_by_exe.get(path, ()):
+            index = self.index(row)
+            self.dataChanged.emit(index, index, [Qt.ItemDataRole.DecorationRole])
+
+
+class LibraryPanel(QWidget):
+    """
+    Filter box, status line and game list. start_scan() (re)runs the scan.
+    """
+
+    def __init__(self, parent=None, icons=None, scan=default_scan, find_executables=default_find_executables):
+        super().__init__(parent)
+        self.scan = scan
+        self.model = GameListModel(self, icons=icons, find_executables=find_executables)
+        self.proxy = QSortFilterProxyModel(self)
+        self.proxy.setSourceModel(self.model)
+        self.proxy.setFilterRole(SearchRole)
+        self.proxy.setFilterCaseSensitivity(Qt.CaseSensitivity.CaseInsensitive)
+
+        self.filterEdit = QLineEdit(self)
+        self.filterEdit.setPlaceholderText("Filter games")
+        self.filterEdit.setClearButtonEnabled(True)
+        self.filterEdit.textChanged.connect(self.set_filter)
+        self.statusLabel = QLabel(self)
+        self.listView = QListView(self)
+        self.listView.setModel(self.proxy)
+        self.listView.setUniformItemSizes(True)
+        self.listView.setIconSize(QSize(ICON_SIZE, ICON_SIZE))
+
+        layout = QVBoxLayout(self)
+        layout.setContentsMargins(0, 0, 0, 0)
+        layout.addWidget(self.filterEdit)
+        layout.addWidget(self.listView)
+        layout.addWidget(self.statusLabel)
+
+        self.worker = None
+        self._generation = 0
+
+    def start_scan(self):
+        self.stop_scan()
+        self.model.clear()
+        self.statusLabel.setText("Scanning...")
+        self.worker = ScanWorker(self.scan, self._generation)
+        self.worker.batch.connect(self.on_batch)
+        self.worker.failed.connect(self.on_failed)
+        self.worker.finished.connect(self.on_finished)
+        self.worker.start()
+
+    def stop_scan(self):
+        """
+        Stop the running scan without waiting for its thread. Whatever it
+        still emits belongs to an old generation and is ignored.
+        """
+        if self.worker is None:
+            return
+        self.worker.stop()
+        self.worker = None
+        self._generation += 1
+
+    def set_filter(self, text):
+        if text:
+            self.model.fetch_all()
+        self.proxy.setFilterFixedString(text)
+
+    def on_batch(self, generation, games):
+        if generation != self._generation:
+            return
+        self.model.add_games(games)
+        if self.filterEdit.text():
+            self.model.fetch_all()
+        self.statusLabel.setText(f"Scanning... {self.model.total()} games")
+
+    def on_failed(self, generation, message):
+        if generation == self._generation:
+            self.statusLabel.setText(f"Scan failed: {message}")
+
+    def on_finished(self, generation):
+        if generation != self._generation:
+            return
+        self.worker = None
+        if not self.statusLabel.text().startswith("Scan failed"):
+            self.statusLabel.setText(f"{self.model.total()} games")
@@ -0,0 +1,100 @@
+"""
+Offscreen check that toggling the overlay does not leak.
+
+    python overlay_check.py [--toggles 3000]
+
+Opens the real ClockWindow offscreen and clicks its small button many
+times, which goes through smallButtonClicked and get_overlay, resizing
+the window now and then so resizeEvent repositions the panel mid-slide.
+Checks that the number of live widgets and the Python memory traced by
+tracemalloc stay flat. Every few hundred clicks the animation is left to
+finish so the hide path runs too.
+"""
+import argparse
+import gc
+import os
+import sys
+import time
+import tracemalloc
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+from PyQt6.QtWidgets import QApplication
+
+from overlay_panel import DEFAULT_DURATION
+
+# Python heap growth tolerated over the whole run, for interpreter caches and the like
+MEMORY_SLACK = 64 * 1024
+SETTLE_EVERY = 500
+RESIZE_EVERY = 7
+SIZES = ((600, 400), (800, 500))
+
+
+def _settle(app, seconds):
+    deadline = time.monotonic() + seconds
+    while time.monotonic() < deadline:
+        app.processEvents()
+
+
+def _toggle(app, window, count):
+    for i in range(count):
+        window.smallButton.click()
+        if i % RESIZE_EVERY == 0:
+            window.resize(*SIZES[i // RESIZE_EVERY % len(SIZES)])
+        app.processEvents()
+        if i % SETTLE_EVERY == SETTLE_EVERY - 1:
+            _settle(app, DEFAULT_DURATION / 1000 * 2)
+
+
+def run(toggles):
+    """
+    Return (widgets before, widgets after, traced bytes before, traced
+    bytes after) around toggles clicks.
+    """
+    app = QApplication.instance() or QApplication(sys.argv)
+    # qt.py only starts its own event loop when run as a script
+    from qt import ClockWindow
+
+    window = ClockWindow()
+    window.resize(*SIZES[0])
+    window.show()
+    # Warm up: lets the library scan settle, builds the panel and runs one open/close cycle
+    _settle(app, 0.5)
+    _toggle(app, window, 2)
+    _settle(app, DEFAULT_DURATION / 1000 * 2)
+    gc.collect()
+    widgets_before = len(QApplication.allWidgets())
+    tracemalloc.start()
+    memory_before = tracemalloc.get_traced_memory()[0]
+
+    _toggle(app, window, toggles)
+    if window.smallButton.isChecked():
+        window.smallButton.click()
+    _settle(app, DEFAULT_DURATION / 1000 * 2)
+    gc.collect()
+    memory_after = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    widgets_after = len(QApplication.allWidgets())
+    hidden = not window.overlay.isVisible()
+    window.libraryPanel.stop_scan()
+    window.ticks.stop()
+    return widgets_before, widgets_after, memory_before, memory_after, hidden
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Overlay toggle leak check")
+    parser.add_argument("--toggles", type=int, default=3000)
+    args = parser.parse_args(argv)
+
+    widgets_before, widgets_after, memory_before, memory_after, hidden = run(args.toggles)
+    growth = memory_after - memory_before
+    print(f"{args.toggles} toggles: widgets {widgets_before} -> {widgets_after}, traced memory {growth:+d} bytes")
+    if widgets_after != widgets_before or growth > MEMORY_SLACK:
+        sys.exit("FAIL: toggling the overlay leaks")
+    if not hidden:
+        sys.exit("FAIL: the overlay is still visible after closing")
+    print("ok")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,80 @@
+"""
+Side overlay panel for the Qt window.
+
+One panel is created the first time it is opened and reused after that:
+opening slides it in from the right edge of its parent with a
+QPropertyAnimation on "pos", closing slides it out and hides it. The
+animation object and the stylesheet are set up once.
+"""
+from PyQt6.QtCore import QEasingCurve, QPoint, QPropertyAnimation, Qt
+from PyQt6.QtWidgets import QWidget
+
+DEFAULT_DURATION = 150
+
+
+class OverlayPanel(QWidget):
+    """
+    Panel pinned to the right edge of parent, top_offset() pixels down.
+    Call reposition() from the parent's resizeEvent.
+    """
+
+    def __init__(self, parent, top_offset=lambda: 0, width=200, height=200, duration=DEFAULT_DURATION):
+        super().__init__(parent)
+        self.top_offset = top_offset
+        self.setFixedSize(width, height)
+        self.setAttribute(Qt.WidgetAttribute.WA_StyledBackground, True)
+        self.setStyleSheet("background-color: rgba(80, 80, 80, 230);")
+        self.opened = False
+
+        self.anim = QPropertyAnimation(self, b"pos", self)
+        self.anim.setDuration(duration)
+        self.anim.setEasingCurve(QEasingCurve.Type.OutQuad)
+        self.anim.finished.connect(self._on_finished)
+        self.hide()
+
+    def _shown_pos(self):
+        return QPoint(self.parentWidget().width() - self.width(), self.top_offset())
+
+    def _hidden_pos(self):
+        return QPoint(self.parentWidget().width(), self.top_offset())
+
+    def open(self):
+        if self.opened:
+            return
+        self.opened = True
+        self.anim.stop()
+        if not self.isVisible():
+            self.move(self._hidden_pos())
+            self.show()
+        self.raise_()
+        self.anim.setStartValue(self.pos())
+        self.anim.setEndValue(self._shown_pos())
+        self.anim.start()
+
+    def close_panel(self):
+        if not self.opened:
+            return
+        self.opened = False
+        self.anim.stop()
+        self.anim.setStartValue(self.pos())
+        self.anim.setEndValue(self._hidden_pos())
+        self.anim.start()
+
+    def toggle(self, opened):
+        if opened:
+            self.open()
+        else:
+            self.close_panel()
+
+    def reposition(self):
+        if not self.isVisible():
+            return
+        target = self._shown_pos() if self.opened else self._hidden_pos()
+        if self.anim.state() == QPropertyAnimation.State.Running:
+            self.anim.setEndValue(target)
+        else:
+            self.move(target)
+
+    def _on_finished(self):
+        if not self.opened:
+            self.hide()
@@ -1,37 +1,55 @@
+import os
 import sys
-import ctypes
-from ctypes import wintypes
 from PyQt6.QtWidgets import QMainWindow, QApplication, QStyle, QGraphicsDropShadowEffect
-from PyQt6.uic import loadUi
-from PyQt6.QtCore import QTimer, Qt, QPoint, QSize, QPropertyAnimation, QEasingCurve
+from PyQt6.QtCore import Qt, QPoint, QSize, QPropertyAnimation, QEasingCurve
 from PyQt6 import QtGui, QtWidgets, QtCore
 from time import strftime, localtime
-import uuid
+from icon_service import IconService
+from library_view import LibraryPanel
+from overlay_panel import OverlayPanel
+from recolor_cache import RecolorCache
+from tick_scheduler import TickScheduler
+from ui_cache import load_ui
+
+# Resolved next to this script so the window starts from any working directory
+UI_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "clock.ui")
+
+# Title bar icon color per theme
+THEMES = {
+    "light": QtGui.QColor(20, 20, 20),
+    "dark": QtGui.QColor(230, 230, 230),
+}
 
 class ClockWindow(QMainWindow):
     def __init__(self):
         super().__init__()
-        loadUi("clock.ui", self)
+        self.overlay = None  # side panel, see get_overlay
+        load_ui(UI_FILE, self)
 
         self.setWindowTitle("E2E")
         # self.setWindowFlags(Qt.WindowType.FramelessWindowHint)
         #self.setWindowFlags(Qt.WindowType.Window | Qt.WindowType.WindowStaysOnTopHint)
         self.setAttribute(Qt.WidgetAttribute.WA_TranslucentBackground)
+
+        # Executable icons load in the background, see get_icon_from_exe
+        self.icons = IconService(self)
+        self.icons.iconReady.connect(self.on_icon_ready)
+        self.maximizeIconPath = None
         
         # Setup title bar buttons
         self.closeButton.clicked.connect(self.animateClose)
         self.minimizeButton.clicked.connect(self.showMinimized)
         self.maximizeButton.clicked.connect(self.maximize)
-        max_icon = self.style().standardIcon(QStyle.StandardPixmap.SP_TitleBarNormalButton)
-        #max_icon = self.style().standardIcon(QStyle.StandardPixmap.SP_MessageBoxWarning)
-        min_icon = self.style().standardIcon(QStyle.StandardPixmap.SP_TitleBarMinButton)
-        close_icon = self.style().standardIcon(QStyle.StandardPixmap.SP_TitleBarCloseButton)
-        close_icon = self.recolor_icon(close_icon, QtGui.QColor(20,20,20))
-        max_icon = self.recolor_icon(max_icon, QtGui.QColor(20,20,20))
-        min_icon = self.recolor_icon(min_icon, QtGui.QColor(20,20,20))
-        self.maximizeButton.setIcon(max_icon)
-        self.minimizeButton.setIcon(min_icon)
-        self.closeButton.setIcon(close_icon)
+        # Base icons are kept so every theme recolors the same icons and hits the cache
+        self.recolorCache = RecolorCache()
+        self.titleIcons = {
+            "maximize": self.style().standardIcon(QStyle.StandardPixmap.SP_TitleBarNormalButton),
+            #"maximize": self.style().standardIcon(QStyle.StandardPixmap.SP_MessageBoxWarning),
+            "minimize": self.style().standardIcon(QStyle.StandardPixmap.SP_TitleBarMinButton),
+            "close": self.style().standardIcon(QStyle.StandardPixmap.SP_TitleBarCloseButton),
+        }
+        self.theme = "light"
+        self.apply_theme(self.theme)
 
         #add drop shadow to close button
         #self.closeButton.setStyleSheet("QPushButton {border-radius: 10px; background-color: rgba(255, 0, 0, 0);}")
@@ -60,12 +78,9 @@ class ClockWindow(QMainWindow):
         self.dragging = False
         self.dragPos = QPoint()
         
-        # Setup clock updating
-        self.timer = QTimer(self)
-        self.timer.setInterval(100)
-        self.timer.timeout.connect(self.update_time)
-        self.timer.start()
-        self.update_time()  # initial update
+        # Setup clock updating: wakes once per second, on the second
+        self.ticks = TickScheduler(self)
+        self.ticks.subscribe(self.labelTime.setText, self.format_time)
         
         checkbox = QtWidgets.QCheckBox()
         checkbox.setText("Check me")
@@ -111,6 +126,12 @@ class ClockWindow(QMainWindow):
         self.titleBar.setMinimumHeight(50)
         self.titleBar.setMaximumHeight(50)
 
+        # Game library below the clock, filled by a background scan once the window is up
+        self.libraryPanel = LibraryPanel(self, icons=self.icons)
+        self.contentLayout.addWidget(self.libraryPanel)
+        QtCore.QTimer.singleShot(0, self.libraryPanel.start_scan)
+        QApplication.instance().aboutToQuit.connect(self.libraryPanel.stop_scan)
+
     # def create_checkable_combobox(items):
     #     combo = QtWidgets.QComboBox()
     #     model = QtGui.QStandardItemModel()
@@ -125,41 +146,23 @@ class ClockWindow(QMainWindow):
     #     return combo
 
     def smallButtonClicked(self):
-        if self.smallButton.isChecked():
-            #create an overlay that sticks to the right side of the window
-            overlay = QtWidgets.QWidget()
-            overlay.setFixedSize(200, 200)
-            overlay.setStyleSheet("background-color: rgba(80, 80, 80, 230);")
-            
-            # Get the position of the button inside of main window
-            pos = self.smallButton.mapTo(self, QPoint(0, 0))
-
-            overlay.move(self.width() - overlay.width(), self.titleBar.height())
-            print(f"pos: {pos.x()}, {pos.y()}\nOther Pos: {self.width() - overlay.width()}")
-            # overlay.move(self.width() - overlay.width(), 100)
-            # Store the overlay as an instance variable
-            self.overlay = overlay
-            # Make the overlay a child of the main window
-            self.overlay.setParent(self)
-            # Show the overlay
-            self.overlay.show()
-            # Bring the overlay to the front
-            self.overlay.raise_()
-        else:
-            print("unchecked")
-            # Hide the overlay
-            self.overlay.hide()
-            # Delete the overlay
-            #self.overlay.deleteLater()
+        # The overlay sticks to the right side of the window; it is built on first use and reused
+        self.get_overlay().toggle(self.smallButton.isChecked())
+
+    def get_overlay(self):
+        if self.overlay is None:
+            self.overlay = OverlayPanel(self, top_offset=self.titleBar.height)
+        return self.overlay
         
     def resizeEvent(self, event):
         #if window is resized, move the overlay to the right side of the window
-        if hasattr(self, 'overlay'):
-            pos = self.smallButton.mapTo(self, QPoint(0, 0))
-            self.overlay.move(self.width() - self.overlay.width(), self.titleBar.height())
-            # Bring the overlay to the front
-            self.overlay.raise_()
-        #super().resizeEvent(event)
+        if self.overlay is not None:
+            self.overlay.reposition()
+        super().resizeEvent(event)
+
+    def closeEvent(self, event):
+        self.libraryPanel.stop_scan()
+        super().closeEvent(event)
 
     def animateClose(self):
         # Animate opacity from 1.0 to 0.0, then minimize.
@@ -172,32 +175,37 @@ class ClockWindow(QMainWindow):
         self.anim.start()
 
     def recolor_icon(self, icon, target_color, size=QSize(32,32)):
-        # Get the original pixmap and convert it to an ARGB image.
-        pixmap = icon.pixmap(size)
-        image = pixmap.toImage().convertToFormat(QtGui.QImage.Format.Format_ARGB32)
-        
-        # Create a new transparent image of the same size.
-        result = QtGui.QImage(image.size(), QtGui.QImage.Format.Format_ARGB32)
-        result.fill(QtGui.QColor(Qt.GlobalColor.transparent))
-        
-        # Use QPainter to draw the original icon and recolor it.
-        painter = QtGui.QPainter(result)
-        painter.setCompositionMode(QtGui.QPainter.CompositionMode.CompositionMode_Source)
-        painter.drawImage(0, 0, image)
-        painter.setCompositionMode(QtGui.QPainter.CompositionMode.CompositionMode_SourceIn)
-        painter.fillRect(result.rect(), target_color)
-        painter.end()
-        
-        return QtGui.QIcon(QtGui.QPixmap.fromImage(result))
+        # Memoized per color, size and this window's device pixel ratio
+        return self.recolorCache.recolor(icon, target_color, size, self.devicePixelRatioF())
+
+    def apply_theme(self, name):
+        # Switching back to a theme reuses its cached icons
+        icons = self.recolorCache.recolor_set(self.titleIcons, THEMES[name], ratio=self.devicePixelRatioF())
+        self.maximizeButton.setIcon(icons["maximize"])
+        self.minimizeButton.setIcon(icons["minimize"])
+        self.closeButton.setIcon(icons["close"])
+        self.theme = name
+
+    def changeEvent(self, event):
+        # Moving to a screen with another scale needs icons rendered for it
+        if event.type() == QtCore.QEvent.Type.DevicePixelRatioChange:
+            self.apply_theme(self.theme)
+        super().changeEvent(event)
      
     def maximize(self):
         # if self.isMaximized():
         #     self.showNormal()
         # else:
         #     self.showMaximized()
-        icon = self.get_icon_from_exe(r"E:\PyMeow\projects\Dishonored_DO.exe")
+        self.maximizeIconPath = r"E:\PyMeow\projects\Dishonored_DO.exe"
+        icon = self.get_icon_from_exe(self.maximizeIconPath)
         self.maximizeButton.setIcon(icon)
 
+    def on_icon_ready(self, path, size, icon):
+        # Swap the placeholder for the real icon once it has loaded
+        if path == self.maximizeIconPath:
+            self.maximizeButton.setIcon(icon)
+
     def mousePressEvent(self, event):
         if self.childAt(event.position().toPoint()) == self.titleBar:
             if event.button() == Qt.MouseButton.LeftButton:
@@ -227,25 +235,15 @@ class ClockWindow(QMainWindow):
         print("double click title bar")
         pass
 
-    def update_time(self):
-        curr_time = strftime("%H:%M:%S", localtime())
-        self.labelTime.setText(curr_time)
-        #self.labelTime.setVisible(False)
+    def format_time(self, now):
+        return strftime("%H:%M:%S", localtime(now))
 
-    def get_icon_from_exe(self, path):
-        model = QtGui.QFileSystemModel()
-        icon = model.fileIcon(model.index(path))
-        
-        print(icon.availableSizes())
-        pixmap = icon.pixmap(256, 256)
-        pixmap.save("icon.png")
-        return icon
+    def get_icon_from_exe(self, path, size=256):
+        # Cached icon, or a placeholder until iconReady delivers the real one
+        return self.icons.icon(path, size)
     
     
 
-import ctypes
-from ctypes import wintypes
-
 # DWMWA_CAPTION_COLOR is 35 on supported systems.
 DWMWA_CAPTION_COLOR = 35
 
@@ -256,6 +254,12 @@ def set_caption_color(window, color_value):
     color_value is converted from HEX to COLORREF: 0x00BBGGRR.
     For example, 0x000000FF for red or #FF0000 for red.
     """
+    if sys.platform != "win32":
+        return
+    # Only needed on Windows, so not imported at startup
+    import ctypes
+    from ctypes import wintypes
+
     #convert color from HEX to BGR
     if "#" in color_value:
         color_value = color_value.lstrip('#')
@@ -276,9 +280,13 @@ def set_caption_color(window, color_value):
 
 
 
-app = QApplication(sys.argv)
-window = ClockWindow()
-window.show()
-set_caption_color(window, "3c3c3c")  # Red title bar
+if __name__ == "__main__":
+    app = QApplication(sys.argv)
+    window = ClockWindow()
+    window.show()
+    set_caption_color(window, "3c3c3c")  # Red title bar
+    if os.environ.get("CLOCK_STARTUP_BENCHMARK"):
+        from startup_benchmark import report_first_paint
+        report_first_paint(window)
 
-sys.exit(app.exec())
\ No newline at end of file
+    sys.exit(app.exec())
@@ -0,0 +1,88 @@
+"""
+Memoized icon recoloring.
+
+Recolored icons are cached by (icon cache key, color, size, device pixel
+ratio), so the title bar icons are rendered once per theme and screen
+scale instead of on every call. Rendering happens at size * ratio device
+pixels, which keeps the icons sharp on high-DPI screens.
+"""
+from collections import OrderedDict
+
+from PyQt6.QtCore import QSize, Qt
+from PyQt6.QtGui import QColor, QGuiApplication, QIcon, QImage, QPainter, QPixmap
+
+DEFAULT_CAPACITY = 256
+DEFAULT_SIZE = QSize(32, 32)
+
+
+def recolor_image(icon, target_color, size=DEFAULT_SIZE, ratio=1.0):
+    """
+    Render icon at size * ratio device pixels and fill its opaque pixels
+    with target_color. Returns a QImage tagged with the ratio.
+    """
+    pixel_size = QSize(round(size.width() * ratio), round(size.height() * ratio))
+    image = icon.pixmap(pixel_size).toImage().convertToFormat(QImage.Format.Format_ARGB32_Premultiplied)
+
+    result = QImage(image.size(), QImage.Format.Format_ARGB32_Premultiplied)
+    result.fill(QColor(Qt.GlobalColor.transparent))
+
+    painter = QPainter(result)
+    painter.setCompositionMode(QPainter.CompositionMode.CompositionMode_Source)
+    painter.drawImage(0, 0, image)
+    painter.setCompositionMode(QPainter.CompositionMode.CompositionMode_SourceIn)
+    painter.fillRect(result.rect(), target_color)
+    painter.end()
+
+    result.setDevicePixelRatio(ratio)
+    return result
+
+
+class RecolorCache:
+    """
+    LRU of recolored QIcons. hits/misses count lookups.
+
+    recolor() handles one icon; recolor_set() a whole {name: icon} set for
+    one color, which is what a theme switch needs.
+    """
+
+    def __init__(self, capacity=DEFAULT_CAPACITY):
+        self.capacity = capacity
+        self._icons = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def device_pixel_ratio(widget=None):
+        if widget is not None:
+            return widget.devicePixelRatioF()
+        screen = QGuiApplication.primaryScreen()
+        return screen.devicePixelRatio() if screen else 1.0
+
+    def recolor(self, icon, target_color, size=DEFAULT_SIZE, ratio=None):
+        ratio = ratio or self.device_pixel_ratio()
+        color = QColor(target_color)
+        key = (icon.cacheKey(), color.rgba(), size.width(), size.height(), ratio)
+        cached = self._icons.get(key)
+        if cached is not None:
+            self._icons.move_to_end(key)
+            self.hits += 1
+            return cached
+        self.misses += 1
+        result = QIcon(QPixmap.fromImage(recolor_image(icon, color, size, ratio)))
+        self._icons[key] = result
+        while len(self._icons) > self.capacity:
+            self._icons.popitem(last=False)
+        return result
+
+    def recolor_set(self, icons, target_color, size=DEFAULT_SIZE, ratio=None):
+        """
+        Recolor every icon of {name: icon} and return {name: recolored}.
+        """
+        ratio = ratio or self.device_pixel_ratio()
+        return {name: self.recolor(icon, target_color, size, ratio) for name, icon in icons.items()}
+
+    def clear(self):
+        self._icons.clear()
+
+    def __len__(self):
+        return len(self._icons)
@@ -0,0 +1,82 @@
+"""
+Startup benchmark for the clock window.
+
+    python startup_benchmark.py [--runs 10]
+
+Launches qt.py in offscreen mode several times and measures the time from
+process start to the window's first paint, with the compiled UI cache and
+with runtime loadUi (UI_CACHE_DISABLE=1). The first cached run may compile
+clock.ui and is reported separately as cold.
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+from PyQt6.QtCore import QEvent, QObject, QTimer
+from PyQt6.QtWidgets import QApplication
+
+QT_SCRIPT = os.path.join(os.path.dirname(os.path.abspath(__file__)), "qt.py")
+
+
+class _FirstPaint(QObject):
+    def eventFilter(self, obj, event):
+        if event.type() == QEvent.Type.Paint:
+            obj.removeEventFilter(self)
+            # Printed as wall clock time so the parent can subtract its spawn time
+            print(json.dumps({"first_paint": time.time()}), flush=True)
+            QTimer.singleShot(0, QApplication.instance().quit)
+        return False
+
+
+def report_first_paint(window):
+    """
+    Print the wall clock time of the window's first paint and quit.
+    Called by qt.py when CLOCK_STARTUP_BENCHMARK is set.
+    """
+    window._firstPaintFilter = _FirstPaint(window)
+    window.installEventFilter(window._firstPaintFilter)
+
+
+def measure(extra_env=None, timeout=30):
+    """
+    Seconds from spawning qt.py to its first paint.
+    """
+    env = dict(os.environ, QT_QPA_PLATFORM="offscreen", CLOCK_STARTUP_BENCHMARK="1", **(extra_env or {}))
+    started = time.time()
+    result = subprocess.run([sys.executable, QT_SCRIPT], env=env, capture_output=True, text=True,
+                            timeout=timeout, cwd=os.path.expanduser("~"))
+    for line in result.stdout.splitlines():
+        if line.startswith("{"):
+            return json.loads(line)["first_paint"] - started
+    raise RuntimeError(f"qt.py did not report a paint:\n{result.stdout}\n{result.stderr}")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Clock window startup benchmark")
+    parser.add_argument("--runs", type=int, default=10)
+    parser.add_argument("--output", help="write the timings as JSON")
+    args = parser.parse_args(argv)
+
+    cold = measure()
+    results = {
+        "cached_cold": cold,
+        "cached": [measure() for _ in range(args.runs)],
+        "loadUi": [measure({"UI_CACHE_DISABLE": "1"}) for _ in range(args.runs)],
+    }
+    print(f"{'mode':>12} {'median ms':>10} {'best ms':>10}")
+    print(f"{'cold':>12} {cold * 1000:>10.1f} {cold * 1000:>10.1f}")
+    for mode in ("cached", "loadUi"):
+        timings = results[mode]
+        print(f"{mode:>12} {statistics.median(timings) * 1000:>10.1f} {min(timings) * 1000:>10.1f}")
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(results, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
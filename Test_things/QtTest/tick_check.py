@@ -0,0 +1,63 @@
+"""
+Offscreen check of the clock's wakeup rate.
+
+    python tick_check.py [--seconds 5]
+
+Opens the real ClockWindow offscreen, lets its TickScheduler drive the time
+label for --seconds and checks that the timer woke up about once per
+elapsed second and the label repainted once per second, instead of the
+old fast polling timer's dozens of wakeups.
+"""
+import argparse
+import os
+import sys
+import time
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+from PyQt6.QtCore import QTimer
+from PyQt6.QtWidgets import QApplication
+
+
+def run(seconds):
+    """
+    Show a ClockWindow for about seconds and return (ticks, repaints,
+    elapsed seconds, label text, expected label text).
+    """
+    app = QApplication.instance() or QApplication(sys.argv)
+    # qt.py only starts its own event loop when run as a script
+    from qt import ClockWindow
+
+    window = ClockWindow()
+    window.show()
+    scheduler = window.ticks
+    # Counted from here, so the window's initial setText does not count
+    ticks, repaints = scheduler.ticks, scheduler.repaints
+    started = time.monotonic()
+    QTimer.singleShot(int(seconds * 1000), app.quit)
+    app.exec()
+    elapsed = time.monotonic() - started
+    label = window.labelTime.text()
+    expected = window.format_time(time.time())
+    window.libraryPanel.stop_scan()
+    scheduler.stop()
+    return scheduler.ticks - ticks, scheduler.repaints - repaints, elapsed, label, expected
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Clock tick rate check")
+    parser.add_argument("--seconds", type=float, default=5)
+    args = parser.parse_args(argv)
+
+    ticks, repaints, elapsed, label, expected = run(args.seconds)
+    print(f"elapsed {elapsed:.2f} s, ticks {ticks}, repaints {repaints}, label {label}")
+    # A tick lands just after each second boundary, so the count is elapsed rounded either way
+    if abs(ticks - elapsed) > 1 or abs(repaints - elapsed) > 1:
+        sys.exit(f"FAIL: expected about {elapsed:.0f} ticks and repaints")
+    if label != expected:
+        sys.exit(f"FAIL: label shows {label}, expected {expected}")
+    print("ok")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,103 @@
+"""
+Clock tick scheduler.
+
+Instead of polling on a fast repeating timer, the scheduler arms one
+single-shot timer for the next boundary any subscriber cares about (the
+next whole second, minute, ...) and sleeps until then. Subscribers give a
+formatter and a setter; the setter, and with it the widget repaint, only
+runs when the formatted value changed.
+
+ticks counts timer wakeups and repaints counts setter calls, so wakeups
+per minute can be checked in a headless run.
+"""
+import math
+import time
+
+from PyQt6.QtCore import QObject, Qt, QTimer
+
+# Fire this long after a boundary so the formatted value has already rolled over
+BOUNDARY_SLACK_MS = 5
+
+
+def next_boundary(now, granularity):
+    """
+    Next multiple of granularity seconds after now, in local time, so that
+    minute and hour boundaries follow the local clock.
+    """
+    offset = time.localtime(now).tm_gmtoff
+    local = now + offset
+    return (math.floor(local / granularity) + 1) * granularity - offset
+
+
+class Subscription:
+    """
+    One subscriber. value is the last value passed to the setter.
+    """
+
+    __slots__ = ('granularity', 'formatter', 'setter', 'value', 'due')
+
+    def __init__(self, granularity, formatter, setter):
+        self.granularity = granularity
+        self.formatter = formatter
+        self.setter = setter
+        self.value = None
+        self.due = 0.0
+
+
+class TickScheduler(QObject):
+    """
+    Drives Subscriptions from a single aligned single-shot timer.
+    """
+
+    def __init__(self, parent=None, clock=time.time):
+        super().__init__(parent)
+        self.clock = clock
+        self.subscriptions = []
+        self.ticks = 0
+        self.repaints = 0
+        self._timer = QTimer(self)
+        self._timer.setSingleShot(True)
+        self._timer.setTimerType(Qt.TimerType.PreciseTimer)
+        self._timer.timeout.connect(self._tick)
+
+    def subscribe(self, setter, formatter, granularity=1.0):
+        """
+        Call setter(formatter(now)) now and then every granularity seconds,
+        on local-time boundaries, whenever the formatted value changed.
+        """
+        subscription = Subscription(granularity, formatter, setter)
+        self.subscriptions.append(subscription)
+        self._update(subscription, self.clock())
+        self._arm()
+        return subscription
+
+    def unsubscribe(self, subscription):
+        self.subscriptions = [s for s in self.subscriptions if s is not subscription]
+        self._arm()
+
+    def stop(self):
+        self._timer.stop()
+
+    def _update(self, subscription, now):
+        value = subscription.formatter(now)
+        if value != subscription.value:
+            subscription.value = value
+            subscription.setter(value)
+            self.repaints += 1
+        subscription.due = next_boundary(now, subscription.granularity)
+
+    def _tick(self):
+        self.ticks += 1
+        now = self.clock()
+        for subscription in self.subscriptions:
+            if now >= subscription.due:
+                self._update(subscription, now)
+        self._arm()
+
+    def _arm(self):
+        if not self.subscriptions:
+            self._timer.stop()
+            return
+        due = min(subscription.due for subscription in self.subscriptions)
+        delay_ms = max(0, math.ceil((due - self.clock()) * 1000)) + BOUNDARY_SLACK_MS
+        self._timer.start(delay_ms)
@@ -0,0 +1,104 @@
+"""
+Compiled .ui module cache.
+
+loadUi parses the XML and builds the widgets by reflection on every start.
+load_ui compiles the .ui file to a Python module once (pyuic), keeps it in
+the per-user cache directory and imports that on later starts, so Python's
+bytecode cache applies too. The module is rebuilt when the .ui file's
+contents change; its mtime and size are checked first so an unchanged file
+is not even hashed.
+
+Set UI_CACHE_DISABLE=1 to fall back to loadUi, e.g. to compare startup times.
+"""
+import hashlib
+import importlib.util
+import io
+import os
+import sys
+
+from PyQt6.QtCore import QStandardPaths
+
+# FindGamePaths is a sibling script folder, not an installed package
+_SCANNER_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "FindGamePaths")
+if _SCANNER_DIR not in sys.path:
+    sys.path.insert(0, _SCANNER_DIR)
+from scan_cache import load_json_cache, save_json_cache
+
+UI_CACHE_VERSION = 1
+
+
+def default_ui_cache_dir():
+    base = QStandardPaths.writableLocation(QStandardPaths.StandardLocation.CacheLocation)
+    return os.path.join(base or os.path.expanduser("~/.cache"), "ui")
+
+
+def _digest(ui_path):
+    with open(ui_path, "rb") as f:
+        return hashlib.sha1(f.read()).hexdigest()
+
+
+def compiled_ui_module(ui_path, cache_dir=None):
+    """
+    Return the path of the compiled module for ui_path, compiling it if the
+    cached one is missing or stale.
+    """
+    cache_dir = cache_dir or default_ui_cache_dir()
+    ui_path = os.path.abspath(ui_path)
+    stat = os.stat(ui_path)
+    index_path = os.path.join(cache_dir, "index.json")
+    files = load_json_cache(index_path, UI_CACHE_VERSION, "files") or {}
+
+    entry = files.get(ui_path)
+    if entry and entry["mtime_ns"] == stat.st_mtime_ns and entry["size"] == stat.st_size:
+        digest = entry["sha1"]
+    else:
+        digest = _digest(ui_path)
+    stem = os.path.splitext(os.path.basename(ui_path))[0]
+    module_path = os.path.join(cache_dir, f"ui_{stem}_{digest[:16]}.py")
+
+    if not os.path.exists(module_path):
+        # pyuic is only imported when something has to be compiled
+        from PyQt6 import uic
+        source = io.StringIO()
+        uic.compileUi(ui_path, source)
+        os.makedirs(cache_dir, exist_ok=True)
+        tmp_path = module_path + ".tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            f.write(source.getvalue())
+        os.replace(tmp_path, module_path)
+
+    if entry != {"mtime_ns": stat.st_mtime_ns, "size": stat.st_size, "sha1": digest}:
+        files[ui_path] = {"mtime_ns": stat.st_mtime_ns, "size": stat.st_size, "sha1": digest}
+        try:
+            save_json_cache(index_path, UI_CACHE_VERSION, "files", files)
+        except OSError:
+            pass
+    return module_path
+
+
+def load_ui(ui_path, widget, cache_dir=None):
+    """
+    Build the UI described by ui_path into widget, like loadUi(ui_path,
+    widget): child widgets and layouts become attributes of widget.
+    """
+    if os.environ.get("UI_CACHE_DISABLE"):
+        from PyQt6.uic import loadUi
+        return loadUi(ui_path, widget)
+
+    try:
+        module_path = compiled_ui_module(ui_path, cache_dir)
+    except OSError:  # cache not writable
+        from PyQt6.uic import loadUi
+        return loadUi(ui_path, widget)
+
+    name = os.path.splitext(os.path.basename(module_path))[0]
+    spec = importlib.util.spec_from_file_location(name, module_path)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+
+    ui_class = next(value for key, value in vars(module).items() if key.startswith("Ui_"))
+    ui = ui_class()
+    ui.setupUi(widget)
+    for key, value in vars(ui).items():
+        setattr(widget, key, value)
+    return widget